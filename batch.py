@@ -0,0 +1,31 @@
+import curator
+import scraper
+import translator
+from manifest import RunManifest
+
+
+def main(output_format: str = "parquet", csv_export: bool = False) -> RunManifest:
+
+    """
+    Runs the scraper, translator and curator one after another as a single batch run.
+
+    Each stage is pointed at the run ID of the manifest the previous stage returned, not at the
+    latest run of its input directory, so batch runs that overlap never read each other's files.
+
+    Args:
+        output_format (str): The output format of every stage, "parquet", "arrow" or "csv". Defaults to "parquet".
+        csv_export (bool): Whether every stage also writes a CSV copy of a Parquet or Arrow output. Defaults to False.
+
+    Returns:
+        RunManifest: The manifest of the curator run.
+    """
+
+    scraper_manifest = scraper.main(output_format, csv_export)
+    translator_manifest = translator.main("scraper_output", output_format=output_format, csv_export=csv_export,
+                                          run_id=scraper_manifest.run_id)
+    return curator.main("translator_output", output_format=output_format, csv_export=csv_export,
+                        run_id=translator_manifest.run_id)
+
+
+if __name__ == "__main__":
+    main()
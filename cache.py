@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List
+
+
+def text_hash(text: str) -> str:
+
+    """
+    Returns a stable hash of a text, used as the text part of cache keys.
+
+    Args:
+        text (str): The text to hash.
+
+    Returns:
+        str: The hex encoded SHA-256 digest of the UTF-8 encoded text.
+    """
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+
+    """
+    A persistent key-value cache stored in a local SQLite file.
+
+    Lookups and inserts work on many keys at once, so callers can check a whole batch before doing
+    any model work. When the stored keys and values grow over the size budget, the least recently
+    used entries are deleted.
+    """
+
+    _chunk_size = 500
+
+    def __init__(self, path: str, max_size_mb: float = 512):
+
+        """
+        Args:
+            path (str): The SQLite file. It is created if it does not exist.
+            max_size_mb (float): The budget in megabytes for stored keys and values. Defaults to 512.
+        """
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+        self._connection.commit()
+
+    @staticmethod
+    def _chunks(keys: List[str], size: int) -> Iterable[List[str]]:
+        for i in range(0, len(keys), size):
+            yield keys[i:i + size]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+
+        """
+        Looks up many keys at once and marks the found entries as recently used.
+
+        Args:
+            keys (Iterable[str]): The keys to look up.
+
+        Returns:
+            Dict[str, str]: The values of the keys that were found.
+        """
+
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, str] = {}
+        with self._lock:
+            for chunk in self._chunks(keys, self._chunk_size):
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self._connection.executemany("UPDATE cache SET accessed = ? WHERE key = ?",
+                                             [(now, key) for key in found])
+                self._connection.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, str]) -> None:
+
+        """
+        Stores many entries at once and evicts the least recently used entries if the cache is over budget.
+
+        Args:
+            items (Dict[str, str]): The keys and values to store.
+        """
+
+        if not items:
+            return
+        now = time.time()
+        rows = [(key, value, len(key.encode("utf-8")) + len(value.encode("utf-8")), now) for key, value in items.items()]
+        with self._lock:
+            self._connection.executemany("INSERT OR REPLACE INTO cache (key, value, size, accessed) VALUES (?, ?, ?, ?)", rows)
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+        freed = 0
+        stale = []
+        for key, size in self._connection.execute("SELECT key, size FROM cache ORDER BY accessed"):
+            if total - freed <= self.max_size_bytes:
+                break
+            stale.append((key,))
+            freed += size
+        self._connection.executemany("DELETE FROM cache WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+    def stats(self) -> Dict[str, float]:
+
+        """
+        Returns the cache counters.
+
+        Returns:
+            Dict[str, float]: Hits, misses, hit rate and evictions since the cache was opened.
+        """
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+
+        """
+        Closes the underlying SQLite connection.
+        """
+
+        self._connection.close()
+
+
+class TranslationCache(SQLiteCache):
+
+    """
+    Caches translations by content hash, source language and model name across runs.
+    """
+
+    @staticmethod
+    def key(text: str, source_language: str, model_name: str) -> str:
+
+        """
+        Builds the cache key of a translation.
+
+        Args:
+            text (str): The source text.
+            source_language (str): The source language code.
+            model_name (str): The name of the model translating the language.
+
+        Returns:
+            str: The cache key.
+        """
+
+        return f"{text_hash(text)}:{source_language}:{model_name}"
+
+
+class RelevanceCache(SQLiteCache):
+
+    """
+    Caches zero-shot relevance results by text hash, candidate labels and model ID across runs.
+
+    Values are stored as JSON holding the top label and the score of every candidate label.
+    """
+
+    @staticmethod
+    def key(text: str, candidate_labels: List[str], model_id: str) -> str:
+
+        """
+        Builds the cache key of a classification result.
+
+        Args:
+            text (str): The classified text.
+            candidate_labels (List[str]): The candidate labels the text was scored against.
+            model_id (str): The ID of the classification model.
+
+        Returns:
+            str: The cache key.
+        """
+
+        return f"{text_hash(text)}:{text_hash(chr(31).join(candidate_labels))}:{model_id}"
+
+    def get_results(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+
+        """
+        Looks up many classification results at once.
+
+        Args:
+            keys (Iterable[str]): The keys to look up.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The decoded results, with "label" and "scores", of the keys that were found.
+        """
+
+        return {key: json.loads(value) for key, value in self.get_many(keys).items()}
+
+    def put_results(self, results: Dict[str, Dict[str, Any]]) -> None:
+
+        """
+        Stores many classification results at once.
+
+        Args:
+            results (Dict[str, Dict[str, Any]]): The results, with "label" and "scores", by key.
+        """
+
+        self.put_many({key: json.dumps(result) for key, result in results.items()})
@@ -0,0 +1,208 @@
+import os
+import pickle
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+RELEVANT_PHRASES = [
+    "artificial intelligence", "machine learning", "deep learning", "neural network", "neural networks",
+    "large language model", "large language models", "llm", "llms", "generative ai", "chatgpt", "gpt-4",
+    "openai", "anthropic", "deepmind", "hugging face", "computer vision", "reinforcement learning",
+    "diffusion model", "diffusion models", "transformer model", "fine-tuning", "ai model", "ai models",
+]
+IRRELEVANT_PHRASES = [
+    "giveaway", "promo code", "discount code", "coupon", "horoscope", "recipe", "follow for follow",
+    "airdrop", "onlyfans", "betting tips", "lottery",
+]
+
+# A decision: whether the row is relevant, the probability that it is relevant, and the deciding stage.
+Decision = Tuple[bool, float, str]
+
+
+class KeywordStage:
+
+    """
+    Decides plainly relevant and plainly irrelevant rows by phrase matching.
+
+    All phrases are matched in one pass over each text with an Aho-Corasick automaton, so the cost
+    does not grow with the number of phrases. A row is relevant if it mentions at least
+    min_relevant distinct relevant phrases and no irrelevant one, and irrelevant if it mentions at
+    least min_irrelevant irrelevant phrases and no relevant one. Requires the pyahocorasick package.
+    """
+
+    name = "keyword"
+
+    def __init__(self, relevant_phrases: Sequence[str] = RELEVANT_PHRASES,
+                 irrelevant_phrases: Sequence[str] = IRRELEVANT_PHRASES, min_relevant: int = 2, min_irrelevant: int = 1):
+
+        """
+        Args:
+            relevant_phrases (Sequence[str]): The phrases that indicate a relevant row. Defaults to RELEVANT_PHRASES.
+            irrelevant_phrases (Sequence[str]): The phrases that indicate an irrelevant row. Defaults to IRRELEVANT_PHRASES.
+            min_relevant (int): The number of distinct relevant phrases that decide a row as relevant. Defaults to 2.
+            min_irrelevant (int): The number of distinct irrelevant phrases that decide a row as irrelevant. Defaults to 1.
+        """
+
+        import ahocorasick
+
+        self.min_relevant = min_relevant
+        self.min_irrelevant = min_irrelevant
+        self.automaton = ahocorasick.Automaton()
+        for phrases, relevant in ((relevant_phrases, True), (irrelevant_phrases, False)):
+            for phrase in phrases:
+                phrase = phrase.lower()
+                self.automaton.add_word(phrase, (phrase, relevant))
+        self.automaton.make_automaton()
+
+    def _matches(self, text: str) -> Tuple[int, int]:
+        relevant, irrelevant = set(), set()
+        for end, (phrase, is_relevant) in self.automaton.iter(text):
+            start = end - len(phrase) + 1
+            if (start > 0 and text[start - 1].isalnum()) or (end + 1 < len(text) and text[end + 1].isalnum()):
+                continue
+            (relevant if is_relevant else irrelevant).add(phrase)
+        return len(relevant), len(irrelevant)
+
+    def decide(self, text: str) -> Optional[Decision]:
+
+        """
+        Decides a row if its phrases make it plainly relevant or irrelevant.
+
+        Args:
+            text (str): The text of the row.
+
+        Returns:
+            Optional[Decision]: The decision, or None if the row is ambiguous.
+        """
+
+        relevant, irrelevant = self._matches(text.lower())
+        if relevant >= self.min_relevant and not irrelevant:
+            return True, 1.0, self.name
+        if irrelevant >= self.min_irrelevant and not relevant:
+            return False, 0.0, self.name
+        return None
+
+
+class TfidfStage:
+
+    """
+    Decides rows on which a TF-IDF logistic regression model is confident.
+
+    Train the model once on rows labeled by the zero-shot model or by hand with train, which pickles
+    it to disk. Requires scikit-learn.
+    """
+
+    name = "tfidf"
+
+    def __init__(self, path: str, min_confidence: float = 0.9):
+
+        """
+        Args:
+            path (str): The pickled model written by train.
+            min_confidence (float): The probability of either class above which a row is decided. Defaults to 0.9.
+        """
+
+        with open(path, "rb") as f:
+            self.model = pickle.load(f)
+        self.min_confidence = min_confidence
+
+    @staticmethod
+    def train(texts: List[str], relevant: List[bool], path: str) -> None:
+
+        """
+        Fits a TF-IDF logistic regression model on labeled rows and pickles it.
+
+        Args:
+            texts (List[str]): The texts of the rows.
+            relevant (List[bool]): Whether each row is relevant.
+            path (str): The file the model is written to.
+        """
+
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+
+        model = make_pipeline(TfidfVectorizer(ngram_range=(1, 2), min_df=2, sublinear_tf=True),
+                              LogisticRegression(max_iter=1000))
+        model.fit(texts, relevant)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(model, f)
+
+    def decide_many(self, texts: List[str]) -> List[Optional[Decision]]:
+
+        """
+        Decides the rows the model is confident on.
+
+        Args:
+            texts (List[str]): The texts of the rows.
+
+        Returns:
+            List[Optional[Decision]]: The decision of each row, or None where the row is ambiguous.
+        """
+
+        if not texts:
+            return []
+        column = list(self.model.classes_).index(True)
+        probabilities = self.model.predict_proba(texts)[:, column]
+        return [(p >= 0.5, float(p), self.name) if max(p, 1 - p) >= self.min_confidence else None
+                for p in probabilities]
+
+
+class RelevanceCascade:
+
+    """
+    Runs cheap stages ahead of the relevance model, so that only ambiguous rows reach the model.
+
+    The keyword stage runs first, then the optional TF-IDF stage on the rows still undecided. The
+    stage that decided each row is counted, to show how much model work the cascade saves.
+    """
+
+    def __init__(self, keyword_stage: Optional[KeywordStage] = None, tfidf_stage: Optional[TfidfStage] = None):
+
+        """
+        Args:
+            keyword_stage (Optional[KeywordStage]): The phrase matching stage. Defaults to a KeywordStage with the default phrases.
+            tfidf_stage (Optional[TfidfStage]): The TF-IDF model stage. Defaults to None.
+        """
+
+        self.keyword_stage = keyword_stage or KeywordStage()
+        self.tfidf_stage = tfidf_stage
+        self.decided: Dict[str, int] = {}
+        self.checked = 0
+
+    def decide_many(self, texts: Iterable[str]) -> List[Optional[Decision]]:
+
+        """
+        Decides the rows the cheap stages are confident on.
+
+        Args:
+            texts (Iterable[str]): The texts of the rows.
+
+        Returns:
+            List[Optional[Decision]]: The decision of each row, or None for the rows left to the model.
+        """
+
+        texts = list(texts)
+        decisions = [self.keyword_stage.decide(text) for text in texts]
+        if self.tfidf_stage is not None:
+            undecided = [i for i, decision in enumerate(decisions) if decision is None]
+            for i, decision in zip(undecided, self.tfidf_stage.decide_many([texts[i] for i in undecided])):
+                decisions[i] = decision
+        self.checked += len(texts)
+        for decision in decisions:
+            if decision is not None:
+                self.decided[decision[2]] = self.decided.get(decision[2], 0) + 1
+        return decisions
+
+    def stats(self) -> Dict[str, float]:
+
+        """
+        Returns the number of rows each stage decided and the share of rows that skipped the model.
+
+        Returns:
+            Dict[str, float]: The rows checked, the rows decided per stage and the decided share.
+        """
+
+        decided = sum(self.decided.values())
+        return {"checked": self.checked, **self.decided, "decided_rate": decided / self.checked if self.checked else 0.0}
@@ -1,22 +1,218 @@
+import argparse
 import os
-import glob
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import time
 from datetime import datetime
-from transformers import pipeline
-from typing import Tuple
+from tqdm import tqdm
+from typing import Dict, List, Optional, Tuple
+from cache import RelevanceCache
+from cascade import KeywordStage, RelevanceCascade, TfidfStage
+from manifest import RunManifest, load_manifest
+from relevance_backends import (DEFAULT_EMBEDDING_MODEL, DEFAULT_ZERO_SHOT_MODEL, EmbeddingClassifier,
+                                load_zero_shot_pipeline, resolve_model_id)
+from storage import TRANSLATED_SCHEMA, output_path, read_frame, write_frame
+
+CATEGORIES = ["High Relevance", "Low Relevance"]
+
+CATEGORY_PROTOTYPES = {
+    "High Relevance": [
+        "News about artificial intelligence, machine learning, large language models or AI research.",
+        "A new AI model, product, dataset, benchmark or paper was released.",
+        "AI policy, regulation, safety or industry news.",
+    ],
+    "Low Relevance": [
+        "Content unrelated to artificial intelligence or machine learning.",
+        "Personal chatter, jokes, memes, advertising or off-topic discussion.",
+    ],
+}
+
+
+TOPICS = [
+    "large language models", "computer vision", "robotics", "AI policy and regulation", "AI safety",
+    "AI research", "AI products", "AI business and funding", "open source AI", "AI hardware",
+]
+TOPIC_THRESHOLD = 0.5
+
+
+def score_column(label: str) -> str:
+    return f"{label.lower().replace(' ', '_')}_score"
+
+
+CURATED_SCHEMA = pa.schema(list(TRANSLATED_SCHEMA) + [("relevance", pa.string()), ("relevance_stage", pa.string())] +
+                           [(score_column(category), pa.float64()) for category in CATEGORIES] +
+                           [("topic_scores", pa.list_(pa.float32())), ("topics", pa.list_(pa.string()))])
 
 
 class RelevanceClassifier:
-    def __init__(self):
-        self.classifier = pipeline("zero-shot-classification")
+    def __init__(self, batch_size: int = 32, cache: Optional[RelevanceCache] = None, model: str = DEFAULT_ZERO_SHOT_MODEL,
+                 backend: str = "torch", model_cache_dir: str = ".cache", mode: str = "zero-shot",
+                 embedding_model: str = DEFAULT_EMBEDDING_MODEL, prototypes: Optional[Dict[str, List[str]]] = None,
+                 cascade: Optional[RelevanceCascade] = None, topics: Optional[List[str]] = None,
+                 topic_threshold: float = TOPIC_THRESHOLD):
+
+        """
+        Args:
+            batch_size (int): The number of texts per pipeline batch. Defaults to 32.
+            cache (Optional[RelevanceCache]): The cache of classification results. Defaults to None.
+            model (str): A key of relevance_backends.ZERO_SHOT_MODELS, e.g. "distilbart", or any Hugging Face
+                         NLI model ID. Defaults to "bart-large".
+            backend (str): "torch", or "onnx" for the int8 ONNX Runtime export. Defaults to "torch".
+            model_cache_dir (str): The directory exported ONNX models are cached in. Defaults to ".cache".
+            mode (str): "zero-shot" for NLI zero-shot classification, or "embedding" to score sentence embeddings
+                        against category prototypes. Defaults to "zero-shot".
+            embedding_model (str): The sentence-transformers model of the embedding mode.
+                                   Defaults to "sentence-transformers/all-MiniLM-L6-v2".
+            prototypes (Optional[Dict[str, List[str]]]): The descriptions or example articles of each category in the
+                                                         embedding mode. Defaults to CATEGORY_PROTOTYPES.
+            cascade (Optional[RelevanceCascade]): The cheap stages that decide easy rows before the model. Defaults to None.
+            topics (Optional[List[str]]): The topics to tag high relevance rows with, e.g. TOPICS, or None to skip
+                                          topic tagging. Requires the zero-shot mode. Defaults to None.
+            topic_threshold (float): The topic score at or above which a row is tagged with the topic. Defaults to 0.5.
+        """
+
+        if topics and mode != "zero-shot":
+            raise ValueError("Topic tagging requires the zero-shot mode")
+
+        start = time.perf_counter()
+        if mode == "zero-shot":
+            self.classifier = load_zero_shot_pipeline(model, backend, model_cache_dir)
+            model_id = resolve_model_id(model)
+            self.model_id = model_id if backend == "torch" else f"{model_id}@{backend}"
+        elif mode == "embedding":
+            prototypes = prototypes or CATEGORY_PROTOTYPES
+            if set(prototypes) != set(CATEGORIES):
+                raise ValueError(f"Prototypes must describe exactly the categories {CATEGORIES}")
+            self.classifier = EmbeddingClassifier(prototypes, embedding_model)
+            self.model_id = self.classifier.model_id
+        else:
+            raise ValueError(f"Unknown classifier mode: {mode}")
+        self.startup_seconds = time.perf_counter() - start
+        self.mode = mode
+        self.cascade = cascade
+        self.topics = topics
+        self.topic_threshold = topic_threshold
+        self.batch_size = batch_size
+        self.cache = cache
+        self.rows_classified = 0
+        self.inference_seconds = 0.0
 
     def classify_relevance(self, text: str) -> str:
-        categories = ["High Relevance", "Low Relevance"]
-        result = self.classifier(text, categories)
-        return categories[result["labels"].index(result["scores"][0])]
+        return self.classify_batch([text])[0][0]
+
+    def classify_batch(self, texts: List[str]) -> Tuple[List[str], Dict[str, List[float]]]:
+
+        """
+        Classifies texts by streaming them through the zero-shot pipeline or the embedding classifier in batches.
+
+        If a cache is set, the results of all distinct texts are looked up in bulk first and only the
+        misses are run through the pipeline.
+
+        Args:
+            texts (List[str]): The texts to classify.
+
+        Returns:
+            Tuple[List[str], Dict[str, List[float]]]: The top label of each text and, per category, the score of each text.
+        """
+
+        results = self._run_model(texts, CATEGORIES)
+        labels = [results[text]["label"] for text in texts]
+        scores = {category: [results[text]["scores"][category] for text in texts] for category in CATEGORIES}
+        return labels, scores
+
+    def tag_topics(self, texts: List[str]) -> Tuple[np.ndarray, List[List[str]]]:
+
+        """
+        Scores texts against all topics in one batched multi-label pass and tags them.
+
+        With multi_label, the pipeline scores each topic independently, so a text can belong to
+        several topics, or to none.
+
+        Args:
+            texts (List[str]): The texts to tag.
+
+        Returns:
+            Tuple[np.ndarray, List[List[str]]]: The float32 score matrix with one row per text and one column
+                                                per topic, and the topics of each text that reach the threshold.
+        """
+
+        results = self._run_model(texts, self.topics, multi_label=True)
+        matrix = np.array([[results[text]["scores"][topic] for topic in self.topics] for text in texts],
+                          dtype=np.float32).reshape(len(texts), len(self.topics))
+        tags = [[topic for topic, score in zip(self.topics, row) if score >= self.topic_threshold] for row in matrix]
+        return matrix, tags
+
+    def _run_model(self, texts: List[str], labels: List[str], multi_label: bool = False) -> Dict[str, Dict]:
+        unique_texts = list(dict.fromkeys(texts))
+        model_id = f"{self.model_id}#multi_label" if multi_label else self.model_id
+        results: Dict[str, Dict] = {}
+        if self.cache is not None:
+            keys = {text: self.cache.key(text, labels, model_id) for text in unique_texts}
+            cached = self.cache.get_results(keys.values())
+            results = {text: cached[key] for text, key in keys.items() if key in cached}
+
+        missing = [text for text in unique_texts if text not in results]
+        new_results = {}
+        if missing:
+            start = time.perf_counter()
+            if self.mode == "embedding":
+                outputs = self.classifier.classify(missing, self.batch_size)
+            else:
+                outputs = self.classifier((text for text in missing), candidate_labels=labels, multi_label=multi_label,
+                                          batch_size=self.batch_size)
+            desc = "Tagging topics" if multi_label else "Classifying"
+            for text, output in zip(missing, tqdm(outputs, total=len(missing), desc=desc)):
+                new_results[text] = {"label": output["labels"][0], "scores": dict(zip(output["labels"], output["scores"]))}
+            self.inference_seconds += time.perf_counter() - start
+            self.rows_classified += len(missing)
+            results.update(new_results)
+            if self.cache is not None:
+                self.cache.put_results({keys[text]: result for text, result in new_results.items()})
+        return results
+
+    def stats(self) -> Dict[str, float]:
+
+        """
+        Returns the model startup time and the inference latency of the rows run through the model.
+
+        Returns:
+            Dict[str, float]: The startup seconds, the number of rows classified by the model and the milliseconds per row.
+        """
+
+        return {
+            "startup_seconds": self.startup_seconds,
+            "rows_classified": self.rows_classified,
+            "ms_per_row": 1000 * self.inference_seconds / self.rows_classified if self.rows_classified else 0.0,
+        }
 
     def process_data(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        data["relevance"] = data["translated_text"].apply(self.classify_relevance)
+        texts = data["translated_text"].fillna("").astype(str).tolist()
+        decisions = self.cascade.decide_many(texts) if self.cascade is not None else [None] * len(texts)
+        undecided = [i for i, decision in enumerate(decisions) if decision is None]
+        model_labels, model_scores = self.classify_batch([texts[i] for i in undecided])
+
+        labels = [(CATEGORIES[0] if decision[0] else CATEGORIES[1]) if decision else None for decision in decisions]
+        stages = [decision[2] if decision else "model" for decision in decisions]
+        scores = {CATEGORIES[0]: [decision[1] if decision else None for decision in decisions],
+                  CATEGORIES[1]: [1 - decision[1] if decision else None for decision in decisions]}
+        for j, i in enumerate(undecided):
+            labels[i] = model_labels[j]
+            for category in CATEGORIES:
+                scores[category][i] = model_scores[category][j]
+
+        data = data.assign(relevance=labels, relevance_stage=stages,
+                           **{score_column(category): scores[category] for category in CATEGORIES})
+        if self.topics:
+            # Only high relevance rows become newsletter sections, so the others are not tagged.
+            relevant = [i for i, label in enumerate(labels) if label == "High Relevance"]
+            topic_scores, topics = self.tag_topics([texts[i] for i in relevant])
+            score_values: List[Optional[np.ndarray]] = [None] * len(texts)
+            topic_values: List[Optional[List[str]]] = [None] * len(texts)
+            for j, i in enumerate(relevant):
+                score_values[i] = topic_scores[j]
+                topic_values[i] = topics[j]
+            data = data.assign(topic_scores=score_values, topics=topic_values)
         high_relevance_data = data[data["relevance"] == "High Relevance"]
         low_relevance_data = data[data["relevance"] == "Low Relevance"]
         return high_relevance_data, low_relevance_data
@@ -26,17 +222,51 @@ class RelevanceClassifier:
         high_relevance_data.to_csv(f"high_relevance_{timestamp}.csv", index=False)
         low_relevance_data.to_csv(f"low_relevance_{timestamp}.csv", index=False)
 
+    def save_data(self, high_relevance_data: pd.DataFrame, low_relevance_data: pd.DataFrame, output_format: str = "parquet",
+                  csv_export: bool = False, output_directory: str = "", run_id: Optional[str] = None) -> List[str]:
+        suffix = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        high_relevance_path = output_path(output_directory, f"high_relevance_{suffix}", output_format)
+        low_relevance_path = output_path(output_directory, f"low_relevance_{suffix}", output_format)
+        write_frame(high_relevance_data, high_relevance_path, CURATED_SCHEMA, csv_export)
+        write_frame(low_relevance_data, low_relevance_path, CURATED_SCHEMA, csv_export)
+        return [high_relevance_path, low_relevance_path]
 
-def main(input_dir: str):
-    list_of_files = glob.glob(os.path.join(input_dir, '*.csv'))
-    latest_file = max(list_of_files, key=os.path.getctime)
-    data = pd.read_csv(latest_file)
-    classifier = RelevanceClassifier()
-    high_relevance_data, low_relevance_data = classifier.process_data(data)
-    classifier.save_data_to_csv(high_relevance_data, low_relevance_data)
 
+def main(input_dir: str, columns: Optional[List[str]] = None, output_format: str = "parquet", csv_export: bool = False,
+         run_id: Optional[str] = None, output_dir: str = "curated_output", model: str = DEFAULT_ZERO_SHOT_MODEL,
+         backend: str = "torch", mode: str = "zero-shot", cascade: bool = False,
+         tfidf_model: Optional[str] = None, tag_topics: bool = False) -> RunManifest:
+    translator_manifest = load_manifest(input_dir, run_id)
+    manifest = RunManifest("curator", input_file=translator_manifest.output_file, parent_run_id=translator_manifest.run_id)
+    data = read_frame(translator_manifest.output_file, columns, TRANSLATED_SCHEMA)
+    cache = RelevanceCache(os.path.join(".cache", "relevance.sqlite"))
+    relevance_cascade = None
+    if cascade:
+        relevance_cascade = RelevanceCascade(KeywordStage(), TfidfStage(tfidf_model) if tfidf_model else None)
+    classifier = RelevanceClassifier(cache=cache, model=model, backend=backend, mode=mode, cascade=relevance_cascade,
+                                     topics=TOPICS if tag_topics else None)
+    try:
+        high_relevance_data, low_relevance_data = classifier.process_data(data)
+    finally:
+        cache.close()
+    print(f"Relevance cache hit rate: {cache.stats()['hit_rate']:.1%}")
+    stats = classifier.stats()
+    print(f"Relevance model {classifier.model_id}: startup {stats['startup_seconds']:.1f}s, "
+          f"{stats['ms_per_row']:.1f} ms/row over {stats['rows_classified']} rows")
+    if relevance_cascade is not None:
+        cascade_stats = relevance_cascade.stats()
+        per_stage = ", ".join(f"{stage}: {count}" for stage, count in relevance_cascade.decided.items())
+        print(f"Relevance cascade decided {cascade_stats['decided_rate']:.1%} of {cascade_stats['checked']} rows ({per_stage})")
+    output_files = classifier.save_data(high_relevance_data, low_relevance_data, output_format, csv_export, output_dir,
+                                        manifest.run_id)
+    manifest.finish(output_files, len(high_relevance_data) + len(low_relevance_data), len(data))
+    manifest.save(output_dir)
+    return manifest
 
-if __name__ == "__main__":
-    input_directory = "translator_output"
-    main(input_directory)
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classify the output of a translator run by relevance.")
+    parser.add_argument("input_directory", nargs="?", default="translator_output")
+    parser.add_argument("--run-id", help="The translator run to classify. Defaults to the latest run.")
+    args = parser.parse_args()
+    main(args.input_directory, run_id=args.run_id)
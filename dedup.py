@@ -0,0 +1,188 @@
+import os
+import pickle
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from datasketch import MinHash, MinHashLSH
+from records import ScrapedItem
+
+TRACKING_PARAMETERS = {"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src", "s", "source"}
+
+_NON_WORD_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+
+    """
+    Normalizes a URL so that links to the same page compare equal.
+
+    The scheme and host are lower-cased, "www." and the fragment are dropped, tracking parameters
+    such as utm_* are removed, the remaining query parameters are sorted, and a trailing slash is
+    stripped.
+
+    Args:
+        url (Optional[str]): The URL.
+
+    Returns:
+        Optional[str]: The canonical URL, or None for empty values.
+    """
+
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMETERS)
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(((parts.scheme or "https").lower(), host, path, urlencode(query), ""))
+
+
+class DedupIndex:
+
+    """
+    Drops scraped items that repeat an item seen before, in this run or in an earlier one.
+
+    An item is a duplicate if its canonical URL was seen before, or if its content is a near
+    duplicate of earlier content by MinHash/LSH over character shingles. The index is pickled to
+    disk so duplicates are also caught across runs. Every URL and content entry records when it was
+    last seen, and entries older than max_age_days are pruned on save, so the index stays bounded.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 5,
+                 max_age_days: float = 30):
+
+        """
+        Args:
+            path (str): The file the index is persisted in. It is created on the first save.
+            threshold (float): The estimated Jaccard similarity above which content counts as a duplicate. Defaults to 0.8.
+            num_perm (int): The number of MinHash permutations. Defaults to 128.
+            shingle_size (int): The length of the character shingles. Defaults to 5.
+            max_age_days (float): Entries not seen for this many days are dropped on save. Defaults to 30.
+        """
+
+        self.path = path
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_age_seconds = max_age_days * 24 * 60 * 60
+        self.params = {"threshold": threshold, "num_perm": num_perm, "shingle_size": shingle_size}
+        self.url_duplicates = 0
+        self.content_duplicates = 0
+        state: Optional[Dict[str, Any]] = None
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+            if state.get("params") != self.params:
+                print(f"Rebuilding dedup index {path}: it was built with {state.get('params')}, not {self.params}")
+                state = None
+        if state is not None:
+            self.lsh: MinHashLSH = state["lsh"]
+            self.urls: Dict[str, float] = state["urls"]
+            self.keys: Dict[str, float] = state["keys"]
+            self.size: int = state["size"]
+        else:
+            self.lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+            self.urls = {}
+            self.keys = {}
+            self.size = 0
+
+    def _minhash(self, text: str) -> Optional[MinHash]:
+        normalized = _NON_WORD_PATTERN.sub(" ", text.lower()).strip()
+        if len(normalized) < self.shingle_size:
+            return None
+        minhash = MinHash(num_perm=self.num_perm)
+        for i in range(len(normalized) - self.shingle_size + 1):
+            minhash.update(normalized[i:i + self.shingle_size].encode("utf-8"))
+        return minhash
+
+    def is_duplicate(self, item: ScrapedItem) -> bool:
+
+        """
+        Checks an item against the index and adds it to the index if it is new.
+
+        Args:
+            item (ScrapedItem): The scraped item.
+
+        Returns:
+            bool: True if the item duplicates an item seen before.
+        """
+
+        now = time.time()
+        url = canonicalize_url(item.url)
+        if url is not None and url in self.urls:
+            self.urls[url] = now
+            self.url_duplicates += 1
+            return True
+
+        minhash = self._minhash(item.content) if isinstance(item.content, str) else None
+        if minhash is not None:
+            matches = self.lsh.query(minhash)
+            if matches:
+                for key in matches:
+                    self.keys[key] = now
+                self.content_duplicates += 1
+                return True
+
+        if url is not None:
+            self.urls[url] = now
+        if minhash is not None:
+            key = str(self.size)
+            self.lsh.insert(key, minhash)
+            self.keys[key] = now
+            self.size += 1
+        return False
+
+    def filter(self, items: List[ScrapedItem]) -> List[ScrapedItem]:
+
+        """
+        Returns the items that are not duplicates, in their original order.
+
+        Args:
+            items (List[ScrapedItem]): The scraped items.
+
+        Returns:
+            List[ScrapedItem]: The new items.
+        """
+
+        return [item for item in items if not self.is_duplicate(item)]
+
+    def prune(self, now: Optional[float] = None) -> int:
+
+        """
+        Drops the URLs and content entries that have not been seen for max_age_days.
+
+        Args:
+            now (Optional[float]): The current UTC epoch timestamp. Defaults to the current time.
+
+        Returns:
+            int: The number of entries dropped.
+        """
+
+        cutoff = (now or time.time()) - self.max_age_seconds
+        expired_urls = [url for url, seen in self.urls.items() if seen < cutoff]
+        for url in expired_urls:
+            del self.urls[url]
+        expired_keys = [key for key, seen in self.keys.items() if seen < cutoff]
+        for key in expired_keys:
+            self.lsh.remove(key)
+            del self.keys[key]
+        return len(expired_urls) + len(expired_keys)
+
+    def save(self) -> None:
+
+        """
+        Prunes expired entries and writes the index to disk, replacing the previous file atomically.
+        """
+
+        self.prune()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"params": self.params, "lsh": self.lsh, "urls": self.urls, "keys": self.keys, "size": self.size}, f)
+        os.replace(tmp_path, self.path)
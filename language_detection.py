@@ -0,0 +1,231 @@
+import os
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional
+from cache import text_hash
+
+DEFAULT_LANGUAGE = 'en'
+
+ENGLISH_STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been but by can could do does for from
+had has have he her his how i if in into is it its just like more most my new no not now of on
+one only or our out over she so some than that the their them then there these they this to up
+us was we what when which who why will with would you your
+""".split())
+
+_WORD_PATTERN = re.compile(r"[a-z']+")
+
+
+class LanguageDetector:
+
+    """
+    Base class of the language detection backends used by Translator.
+
+    Subclasses implement _detect_batch. Results are cached by text hash, so repeated texts are
+    only detected once per detector, and texts that are not strings or cannot be detected get
+    DEFAULT_LANGUAGE.
+    """
+
+    def __init__(self):
+        self._cache: Dict[str, str] = {}
+
+    def _detect_batch(self, texts: List[str]) -> List[str]:
+
+        """
+        Detects the language of each text. To be implemented by subclasses.
+
+        Args:
+            texts (List[str]): The texts, all non-empty strings.
+
+        Returns:
+            List[str]: The language code of each text.
+        """
+
+        raise NotImplementedError
+
+    def detect_many(self, texts: List[object]) -> List[str]:
+
+        """
+        Detects the language of every text in one pass.
+
+        Args:
+            texts (List[object]): The texts. Values that are not strings are treated as English.
+
+        Returns:
+            List[str]: The language code of each text, in the input order.
+        """
+
+        hashes = [text_hash(text) if isinstance(text, str) and text.strip() else None for text in texts]
+        missing = {h: text for h, text in zip(hashes, texts) if h is not None and h not in self._cache}
+        if missing:
+            detected = self._detect_batch(list(missing.values()))
+            self._cache.update(zip(missing.keys(), detected))
+        return [self._cache[h] if h is not None else DEFAULT_LANGUAGE for h in hashes]
+
+    def detect(self, text: object) -> str:
+
+        """
+        Detects the language of a single text.
+
+        Args:
+            text (object): The text. Values that are not strings are treated as English.
+
+        Returns:
+            str: The language code.
+        """
+
+        return self.detect_many([text])[0]
+
+
+class LangdetectDetector(LanguageDetector):
+
+    """
+    Detects languages with langdetect, seeded so that repeated runs give the same results.
+    """
+
+    def __init__(self, seed: int = 0):
+
+        """
+        Args:
+            seed (int): The seed of langdetect's random sampling. Defaults to 0.
+        """
+
+        super().__init__()
+        from langdetect import DetectorFactory
+        DetectorFactory.seed = seed
+
+    def _detect_batch(self, texts: List[str]) -> List[str]:
+        from langdetect import detect_langs
+
+        languages = []
+        for text in texts:
+            try:
+                languages.append(detect_langs(text)[0].lang)
+            except Exception:
+                languages.append(DEFAULT_LANGUAGE)  # return a default language when detection fails
+        return languages
+
+
+class FastTextDetector(LanguageDetector):
+
+    """
+    Detects languages with the compiled fastText language identification model (lid.176).
+
+    Requires the fasttext package and the lid.176.ftz or lid.176.bin model file, available from
+    https://fasttext.cc/docs/en/language-identification.html.
+    """
+
+    def __init__(self, model_path: str, min_confidence: float = 0.3):
+
+        """
+        Args:
+            model_path (str): The path of the lid.176 model file.
+            min_confidence (float): Predictions below this probability fall back to DEFAULT_LANGUAGE. Defaults to 0.3.
+        """
+
+        super().__init__()
+        import fasttext
+        self.model = fasttext.load_model(model_path)
+        self.min_confidence = min_confidence
+
+    def _detect_batch(self, texts: List[str]) -> List[str]:
+        labels, probabilities = self.model.predict([text.replace("\n", " ") for text in texts], k=1)
+        return [
+            label[0].replace("__label__", "") if probability[0] >= self.min_confidence else DEFAULT_LANGUAGE
+            for label, probability in zip(labels, probabilities)
+        ]
+
+
+class EnglishPrefilter:
+
+    """
+    Cheaply marks texts as English so they can skip language detection and translation.
+
+    A text passes if it comes from a platform that only publishes English, or if nearly all of its
+    characters are ASCII and enough of its words are common English stopwords. ASCII alone does not
+    tell English from Spanish, German or Indonesian, so texts too short for the stopword check are
+    left to language detection.
+    """
+
+    def __init__(self, min_ascii_ratio: float = 0.98, min_stopword_ratio: float = 0.15, min_words: int = 3,
+                 english_platforms: Iterable[str] = ("AI Weekly", "AI Topics")):
+
+        """
+        Args:
+            min_ascii_ratio (float): The minimum share of ASCII characters. Defaults to 0.98.
+            min_stopword_ratio (float): The minimum share of words that are English stopwords. Defaults to 0.15.
+            min_words (int): Texts with fewer words never pass and are left to language detection. Defaults to 3.
+            english_platforms (Iterable[str]): Platforms whose texts are always English. Defaults to AI Weekly and AI Topics.
+        """
+
+        self.min_ascii_ratio = min_ascii_ratio
+        self.min_stopword_ratio = min_stopword_ratio
+        self.min_words = min_words
+        self.english_platforms: FrozenSet[str] = frozenset(english_platforms)
+        self.checked = 0
+        self.passed = 0
+
+    def is_english(self, text: object, platform: Optional[str] = None) -> bool:
+
+        """
+        Returns whether a text can be treated as English without running language detection.
+
+        Args:
+            text (object): The text. Values that are not strings pass, as they are not translated anyway.
+            platform (Optional[str]): The platform the text was scraped from. Defaults to None.
+
+        Returns:
+            bool: True if the text can skip detection and translation.
+        """
+
+        if platform in self.english_platforms or not isinstance(text, str):
+            return True
+        if not text:
+            return True
+        ascii_ratio = sum(ch.isascii() for ch in text) / len(text)
+        if ascii_ratio < self.min_ascii_ratio:
+            return False
+        words = _WORD_PATTERN.findall(text.lower())
+        if len(words) < self.min_words:
+            return False
+        hits = sum(word in ENGLISH_STOPWORDS for word in words)
+        return hits > 0 and hits / len(words) >= self.min_stopword_ratio
+
+    def filter(self, texts: List[object], platforms: Optional[List[Optional[str]]] = None) -> List[bool]:
+
+        """
+        Checks many texts and counts how many pass.
+
+        Args:
+            texts (List[object]): The texts.
+            platforms (Optional[List[Optional[str]]]): The platform of each text. Defaults to None.
+
+        Returns:
+            List[bool]: Whether each text can skip detection and translation.
+        """
+
+        if platforms is None:
+            platforms = [None] * len(texts)
+        mask = [self.is_english(text, platform) for text, platform in zip(texts, platforms)]
+        self.checked += len(mask)
+        self.passed += sum(mask)
+        return mask
+
+
+def create_detector(backend: str = "langdetect", model_path: Optional[str] = None) -> LanguageDetector:
+
+    """
+    Creates a language detector by backend name.
+
+    Args:
+        backend (str): Either "langdetect" or "fasttext". Defaults to "langdetect".
+        model_path (Optional[str]): The fastText model file. Defaults to lid.176.ftz in the working directory.
+
+    Returns:
+        LanguageDetector: The detector.
+    """
+
+    if backend == "langdetect":
+        return LangdetectDetector()
+    if backend == "fasttext":
+        return FastTextDetector(model_path or os.path.join(os.getcwd(), "lid.176.ftz"))
+    raise ValueError(f"Unknown language detection backend: {backend}")
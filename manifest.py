@@ -0,0 +1,155 @@
+import datetime
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+LATEST_FILE = "latest.json"
+MANIFEST_DIRECTORY = "manifests"
+
+
+def new_run_id(stage: str) -> str:
+
+    """
+    Creates a unique run ID that sorts by start time.
+
+    Args:
+        stage (str): The stage name, e.g. "scraper".
+
+    Returns:
+        str: The run ID.
+    """
+
+    return f"{stage}_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_{uuid.uuid4().hex[:8]}"
+
+
+class RunManifest:
+
+    """
+    Describes one run of a pipeline stage: its input, its outputs, row counts and timings.
+
+    Each stage writes a manifest into its output directory, and the next stage resolves its input
+    from it instead of searching the directory for the newest file.
+    """
+
+    def __init__(self, stage: str, run_id: Optional[str] = None, input_file: Optional[str] = None,
+                 parent_run_id: Optional[str] = None):
+
+        """
+        Args:
+            stage (str): The stage name, e.g. "scraper".
+            run_id (Optional[str]): The run ID. Defaults to a new unique ID.
+            input_file (Optional[str]): The file the stage read, if any. Defaults to None.
+            parent_run_id (Optional[str]): The run ID of the stage that produced the input. Defaults to None.
+        """
+
+        self.stage = stage
+        self.run_id = run_id or new_run_id(stage)
+        self.input_file = input_file
+        self.parent_run_id = parent_run_id
+        self.output_files: List[str] = []
+        self.rows_in: Optional[int] = None
+        self.rows_out: Optional[int] = None
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def output_file(self) -> Optional[str]:
+        return self.output_files[0] if self.output_files else None
+
+    def finish(self, output_files: List[str], rows_out: int, rows_in: Optional[int] = None) -> None:
+
+        """
+        Records the outputs of the run and stops its clock.
+
+        Args:
+            output_files (List[str]): The files the stage wrote; the first one is the main output.
+            rows_out (int): The number of rows written.
+            rows_in (Optional[int]): The number of rows read. Defaults to None.
+        """
+
+        self.output_files = [os.path.abspath(path) for path in output_files]
+        self.rows_out = rows_out
+        self.rows_in = rows_in
+        self.finished_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "run_id": self.run_id,
+            "parent_run_id": self.parent_run_id,
+            "input_file": self.input_file,
+            "output_files": self.output_files,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": self.finished_at - self.started_at if self.finished_at is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "RunManifest":
+        manifest = cls(values["stage"], values["run_id"], values.get("input_file"), values.get("parent_run_id"))
+        manifest.output_files = values.get("output_files", [])
+        manifest.rows_in = values.get("rows_in")
+        manifest.rows_out = values.get("rows_out")
+        manifest.started_at = values["started_at"]
+        manifest.finished_at = values.get("finished_at")
+        return manifest
+
+    def save(self, directory: str) -> str:
+
+        """
+        Writes the manifest into a stage output directory and points the directory's latest.json at it.
+
+        Both files are replaced atomically, so a concurrent reader never sees a partial manifest.
+
+        Args:
+            directory (str): The stage output directory.
+
+        Returns:
+            str: The path of the manifest file.
+        """
+
+        manifest_directory = os.path.join(directory, MANIFEST_DIRECTORY)
+        os.makedirs(manifest_directory, exist_ok=True)
+        path = os.path.join(manifest_directory, f"{self.run_id}.json")
+        _write_json(path, self.to_dict())
+        _write_json(os.path.join(directory, LATEST_FILE), self.to_dict())
+        return path
+
+
+def _write_json(path: str, values: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(values, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(directory: str, run_id: Optional[str] = None) -> RunManifest:
+
+    """
+    Loads the manifest of a specific run, or of the latest run, from a stage output directory.
+
+    Pass a run ID to chain stages of one pipeline run explicitly, which stays correct when several
+    pipelines write to the same directories at once; batch.main does this for a full run. The
+    latest run is only a convenience for running a single stage by hand.
+
+    Args:
+        directory (str): The stage output directory.
+        run_id (Optional[str]): The run to load. Defaults to the latest run.
+
+    Returns:
+        RunManifest: The manifest.
+
+    Raises:
+        FileNotFoundError: If the directory has no such manifest.
+    """
+
+    if run_id is None:
+        path = os.path.join(directory, LATEST_FILE)
+    else:
+        path = os.path.join(directory, MANIFEST_DIRECTORY, f"{run_id}.json")
+    with open(path) as f:
+        return RunManifest.from_dict(json.load(f))
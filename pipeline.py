@@ -0,0 +1,234 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+import pandas as pd
+from cache import RelevanceCache, TranslationCache
+from curator import RelevanceClassifier
+from dedup import DedupIndex
+from language_detection import EnglishPrefilter
+from manifest import new_run_id
+from records import items_to_frame
+from scraper import TwitterScraper, run_scrapers
+from state_store import HighWaterMarkStore
+from translator import DEFAULT_CACHE_DIR, Translator
+
+_DONE = object()
+
+
+async def next_batch(queue: asyncio.Queue, max_items: int, max_wait: float) -> Tuple[List[Any], bool]:
+
+    """
+    Collects a micro-batch from a stage queue.
+
+    Waits for the first item, then keeps collecting until max_items are gathered, max_wait seconds
+    have passed, or the upstream stage signals that it is done.
+
+    Args:
+        queue (asyncio.Queue): The queue to read from.
+        max_items (int): The maximum number of items in the batch.
+        max_wait (float): The maximum number of seconds to wait for a full batch after the first item.
+
+    Returns:
+        Tuple[List[Any], bool]: The items, and whether the upstream stage is done.
+    """
+
+    loop = asyncio.get_running_loop()
+    item = await queue.get()
+    if item is _DONE:
+        return [], True
+    items = [item]
+    deadline = loop.time() + max_wait
+    while len(items) < max_items:
+        timeout = deadline - loop.time()
+        if timeout <= 0:
+            break
+        try:
+            item = await asyncio.wait_for(queue.get(), timeout)
+        except asyncio.TimeoutError:
+            break
+        if item is _DONE:
+            return items, True
+        items.append(item)
+    return items, False
+
+
+class Pipeline:
+
+    """
+    Streams scraped items through translation and relevance classification over bounded asyncio queues.
+
+    Scraping, translation and classification run at the same time. Each stage hands micro-batches to
+    the next through a bounded queue, so a slow stage makes the stages before it wait instead of
+    buffering everything in memory. The translation and classification models run on their own
+    worker threads, so the event loop keeps scraping while they work. Curated rows are appended to
+    the output CSVs as soon as a batch is classified, and no intermediate files are written.
+    """
+
+    def __init__(self, translator: Translator, classifier: RelevanceClassifier, dedup_index: Optional[DedupIndex] = None,
+                 output_directory: str = "curated_output", queue_size: int = 256, batch_size: int = 64, max_wait: float = 2.0):
+
+        """
+        Args:
+            translator (Translator): The translator of the translation stage.
+            classifier (RelevanceClassifier): The classifier of the classification stage.
+            dedup_index (Optional[DedupIndex]): The index that drops duplicates before translation. Defaults to None.
+            output_directory (str): The directory the curated CSVs are written to. Defaults to "curated_output".
+            queue_size (int): The capacity of each stage queue. Defaults to 256.
+            batch_size (int): The maximum number of rows per micro-batch. Defaults to 64.
+            max_wait (float): The maximum number of seconds a stage waits to fill a micro-batch. Defaults to 2.
+        """
+
+        self.translator = translator
+        self.classifier = classifier
+        self.dedup_index = dedup_index
+        self.output_directory = output_directory
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.run_id = new_run_id("pipeline")
+        self.high_relevance_path = os.path.join(output_directory, f"high_relevance_{self.run_id}.csv")
+        self.low_relevance_path = os.path.join(output_directory, f"low_relevance_{self.run_id}.csv")
+        self.rows_scraped = 0
+        self.rows_curated = 0
+
+    async def scrape(self, sink: asyncio.Queue, state: Optional[HighWaterMarkStore], twitter_query: Optional[str],
+                     num_twitter_results: int) -> None:
+
+        """
+        Runs all scrapers and streams their items into the sink, then signals the end of the stream.
+
+        The Twitter scraper does not support asyncio, so it runs on its own thread and its tweets are
+        bridged into the sink one by one as the thread produces them.
+
+        Args:
+            sink (asyncio.Queue): The queue of the translation stage.
+            state (Optional[HighWaterMarkStore]): The store of items seen on earlier runs.
+            twitter_query (Optional[str]): The Twitter search query, or None to skip Twitter.
+            num_twitter_results (int): The maximum number of tweets to scrape.
+        """
+
+        async def scrape_twitter() -> None:
+            twitter_scraper = TwitterScraper(state)
+            twitter_scraper.start_scrape(twitter_query, num_twitter_results, stream=True)
+            async for row in twitter_scraper.stream():
+                await sink.put(row)
+            await asyncio.get_running_loop().run_in_executor(None, twitter_scraper.join)
+
+        try:
+            tasks = [run_scrapers(state=state, sink=sink)]
+            if twitter_query is not None:
+                tasks.append(scrape_twitter())
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Scraping failed: {result!r}")
+        finally:
+            await sink.put(_DONE)
+
+    async def translate(self, source: asyncio.Queue, sink: asyncio.Queue, executor: ThreadPoolExecutor) -> None:
+
+        """
+        Drops duplicates from micro-batches of scraped items, translates them and passes them on as DataFrames.
+
+        Args:
+            source (asyncio.Queue): The queue of scraped items.
+            sink (asyncio.Queue): The queue of the classification stage.
+            executor (ThreadPoolExecutor): The worker thread the translation model runs on.
+        """
+
+        loop = asyncio.get_running_loop()
+        try:
+            done = False
+            while not done:
+                rows, done = await next_batch(source, self.batch_size, self.max_wait)
+                if not rows:
+                    continue
+                self.rows_scraped += len(rows)
+                if self.dedup_index is not None:
+                    rows = self.dedup_index.filter(rows)
+                    if not rows:
+                        continue
+                frame = items_to_frame(rows)
+                translated = await loop.run_in_executor(executor, self.translator.process_data, frame)
+                await sink.put(translated)
+        finally:
+            await sink.put(_DONE)
+
+    async def classify(self, source: asyncio.Queue, executor: ThreadPoolExecutor) -> None:
+
+        """
+        Classifies translated DataFrames and appends the curated rows to the output CSVs.
+
+        Args:
+            source (asyncio.Queue): The queue of translated DataFrames.
+            executor (ThreadPoolExecutor): The worker thread the classification model runs on.
+        """
+
+        loop = asyncio.get_running_loop()
+        while True:
+            frame = await source.get()
+            if frame is _DONE:
+                break
+            high_relevance_data, low_relevance_data = await loop.run_in_executor(executor, self.classifier.process_data, frame)
+            self.append_csv(high_relevance_data, self.high_relevance_path)
+            self.append_csv(low_relevance_data, self.low_relevance_path)
+            self.rows_curated += len(frame)
+            print(f"Curated {self.rows_curated} rows ({self.rows_scraped} scraped so far)")
+
+    @staticmethod
+    def append_csv(data: pd.DataFrame, path: str) -> None:
+        if data.empty:
+            return
+        data.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+
+    async def run(self, state: Optional[HighWaterMarkStore] = None, twitter_query: Optional[str] = None,
+                  num_twitter_results: int = 1000) -> None:
+
+        """
+        Runs all stages until every scraped item has been curated.
+
+        Args:
+            state (Optional[HighWaterMarkStore]): The store of items seen on earlier runs. Defaults to None.
+            twitter_query (Optional[str]): The Twitter search query, or None to skip Twitter. Defaults to None.
+            num_twitter_results (int): The maximum number of tweets to scrape. Defaults to 1000.
+        """
+
+        os.makedirs(self.output_directory, exist_ok=True)
+        scraped: asyncio.Queue = asyncio.Queue(self.queue_size)
+        translated: asyncio.Queue = asyncio.Queue(max(1, self.queue_size // self.batch_size))
+        with ThreadPoolExecutor(1) as translate_executor, ThreadPoolExecutor(1) as classify_executor:
+            await asyncio.gather(
+                self.scrape(scraped, state, twitter_query, num_twitter_results),
+                self.translate(scraped, translated, translate_executor),
+                self.classify(translated, classify_executor),
+            )
+
+
+def main(english_prefilter: bool = True) -> None:
+    """
+    Scrapes, translates and curates in one streaming run, writing only the curated CSVs.
+
+    Args:
+        english_prefilter (bool): Whether rows that are obviously English skip language detection. Defaults to True.
+    """
+
+    state = HighWaterMarkStore(os.path.join('scraper_output', 'scrape_state.json'))
+    translation_cache = TranslationCache(os.path.join(DEFAULT_CACHE_DIR, "translations.sqlite"))
+    relevance_cache = RelevanceCache(os.path.join(".cache", "relevance.sqlite"))
+    translator = Translator(translation_cache=translation_cache, prefilter=EnglishPrefilter() if english_prefilter else None)
+    classifier = RelevanceClassifier(cache=relevance_cache)
+    dedup_index = DedupIndex(os.path.join('scraper_output', 'dedup_index.pkl'))
+    pipeline = Pipeline(translator, classifier, dedup_index)
+    twitter_query = '("artificial intelligence" OR "AI" OR "GPT" OR "GPT-4" OR "OpenAI")'
+    try:
+        asyncio.run(pipeline.run(state, twitter_query))
+        state.save()
+        dedup_index.save()
+    finally:
+        translation_cache.close()
+        relevance_cache.close()
+
+
+if __name__ == "__main__":
+    main()
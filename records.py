@@ -0,0 +1,109 @@
+from typing import Any, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+PLATFORMS = ["Twitter", "Reddit", "AI Weekly", "AI Topics"]
+
+
+class ScrapedItem:
+
+    """
+    A single scraped post, tweet or article.
+
+    The class uses __slots__, so an item costs a fraction of the memory of a tuple plus a dict, and
+    its fields are typed instead of being positions in an untyped 6-tuple.
+    """
+
+    __slots__ = ("platform", "user", "id", "content", "timestamp", "url", "hashtags")
+
+    def __init__(self, platform: str, user: str, id: Optional[int], content: str, timestamp: Optional[float] = None,
+                 url: Optional[str] = None, hashtags: Optional[List[str]] = None):
+
+        """
+        Args:
+            platform (str): The source platform, one of PLATFORMS.
+            user (str): The author or publisher.
+            id (Optional[int]): The numeric ID of the item on its platform, if it has one.
+            content (str): The text of the item.
+            timestamp (Optional[float]): The UTC epoch timestamp of the item, if known. Defaults to None.
+            url (Optional[str]): The link of the item. Defaults to None.
+            hashtags (Optional[List[str]]): The hashtags of the item. Defaults to None.
+        """
+
+        self.platform = platform
+        self.user = user
+        self.id = id
+        self.content = content
+        self.timestamp = timestamp
+        self.url = url
+        self.hashtags = hashtags
+
+    def __repr__(self) -> str:
+        return f"ScrapedItem(platform={self.platform!r}, id={self.id!r}, content={self.content[:40]!r})"
+
+
+def parse_id(platform: str, value: Any) -> Optional[int]:
+
+    """
+    Converts a platform's item ID to an integer.
+
+    Reddit IDs are base 36 strings, the IDs of other platforms are decimal.
+
+    Args:
+        platform (str): The source platform.
+        value (Any): The ID as scraped or as read back from a file.
+
+    Returns:
+        Optional[int]: The ID, or None for empty values.
+    """
+
+    if value is None or value == "" or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, float):
+        return int(value)
+    return int(str(value), 36 if platform == "Reddit" else 10)
+
+
+def platform_column(platforms: Sequence[str]) -> pd.Categorical:
+
+    """
+    Builds a categorical column over the fixed PLATFORMS categories.
+
+    Args:
+        platforms (Sequence[str]): The platform of each row.
+
+    Returns:
+        pd.Categorical: The column.
+    """
+
+    return pd.Categorical(platforms, categories=PLATFORMS)
+
+
+def items_to_frame(items: Sequence[ScrapedItem]) -> pd.DataFrame:
+
+    """
+    Converts scraped items to a DataFrame with typed columns in a single pass per column.
+
+    Platform becomes a categorical, ID a nullable int64, Date a UTC datetime64, and URL and
+    Hashtags are separate columns.
+
+    Args:
+        items (Sequence[ScrapedItem]): The scraped items.
+
+    Returns:
+        pd.DataFrame: The items, with the columns of storage.SCRAPE_SCHEMA.
+    """
+
+    timestamps = np.fromiter((np.nan if item.timestamp is None else item.timestamp for item in items),
+                             dtype=np.float64, count=len(items))
+    return pd.DataFrame({
+        "Platform": platform_column([item.platform for item in items]),
+        "User": [item.user for item in items],
+        "ID": pd.array([item.id for item in items], dtype="Int64"),
+        "Content": [item.content for item in items],
+        "Date": pd.to_datetime(timestamps, unit="s", utc=True),
+        "URL": [item.url for item in items],
+        "Hashtags": [item.hashtags for item in items],
+    })
@@ -0,0 +1,172 @@
+import json
+import os
+from typing import Any, Dict, List, Sequence
+import numpy as np
+from transformers import AutoTokenizer, Pipeline, pipeline
+from cache import text_hash
+
+ZERO_SHOT_MODELS = {
+    "bart-large": "facebook/bart-large-mnli",
+    "distilbart": "valhalla/distilbart-mnli-12-1",
+    "distilroberta": "cross-encoder/nli-distilroberta-base",
+}
+DEFAULT_ZERO_SHOT_MODEL = "bart-large"
+ONNX_MODEL_FILE = "model_quantized.onnx"
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def resolve_model_id(model: str) -> str:
+
+    """
+    Resolves a model preset to its Hugging Face model ID.
+
+    Args:
+        model (str): A key of ZERO_SHOT_MODELS, or any Hugging Face NLI model ID.
+
+    Returns:
+        str: The model ID.
+    """
+
+    return ZERO_SHOT_MODELS.get(model, model)
+
+
+def export_onnx(model_id: str, cache_dir: str) -> str:
+
+    """
+    Exports an NLI model to ONNX with int8 dynamic quantization, once.
+
+    The quantized model is cached under <cache_dir>/onnx, so later runs only load it. Requires the
+    optimum[onnxruntime] package.
+
+    Args:
+        model_id (str): The Hugging Face model ID.
+        cache_dir (str): The directory the exported models are cached in.
+
+    Returns:
+        str: The directory of the exported model.
+    """
+
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    export_dir = os.path.join(cache_dir, "onnx", f"{model_id.replace('/', '--')}-int8")
+    if os.path.exists(os.path.join(export_dir, ONNX_MODEL_FILE)):
+        return export_dir
+
+    model = ORTModelForSequenceClassification.from_pretrained(model_id, export=True)
+    model.save_pretrained(export_dir)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(export_dir)
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantizer.quantize(save_dir=export_dir, quantization_config=AutoQuantizationConfig.avx2(is_static=False))
+    return export_dir
+
+
+def load_zero_shot_pipeline(model: str = DEFAULT_ZERO_SHOT_MODEL, backend: str = "torch",
+                            cache_dir: str = ".cache") -> Pipeline:
+
+    """
+    Loads a zero-shot classification pipeline on the given inference backend.
+
+    Args:
+        model (str): A key of ZERO_SHOT_MODELS, or any Hugging Face NLI model ID. Defaults to "bart-large".
+        backend (str): "torch" for the PyTorch model, or "onnx" for the int8 ONNX Runtime export. Defaults to "torch".
+        cache_dir (str): The directory exported ONNX models are cached in. Defaults to ".cache".
+
+    Returns:
+        Pipeline: The zero-shot classification pipeline.
+    """
+
+    model_id = resolve_model_id(model)
+    if backend == "torch":
+        return pipeline("zero-shot-classification", model=model_id)
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+
+        export_dir = export_onnx(model_id, cache_dir)
+        ort_model = ORTModelForSequenceClassification.from_pretrained(export_dir, file_name=ONNX_MODEL_FILE)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        return pipeline("zero-shot-classification", model=ort_model, tokenizer=tokenizer)
+    raise ValueError(f"Unknown relevance backend: {backend}")
+
+
+class EmbeddingClassifier:
+
+    """
+    Classifies texts by cosine similarity to label prototype embeddings.
+
+    Each label is described by one or more texts, e.g. a short description of a newsletter section
+    or a few example articles. Their normalized mean embedding is the label's prototype. Texts are
+    encoded once by a small sentence-embedding model and scored against all prototypes with one
+    matrix multiply per batch, so the cost barely grows with the number of labels, unlike zero-shot
+    NLI, which runs one forward pass per text and label. Requires the sentence-transformers package.
+    """
+
+    def __init__(self, prototypes: Dict[str, List[str]], model: str = DEFAULT_EMBEDDING_MODEL, temperature: float = 0.05):
+
+        """
+        Args:
+            prototypes (Dict[str, List[str]]): The descriptions or example texts of each label.
+            model (str): The sentence-transformers model ID. Defaults to "sentence-transformers/all-MiniLM-L6-v2".
+            temperature (float): The softmax temperature that turns similarities into scores. Defaults to 0.05.
+        """
+
+        from sentence_transformers import SentenceTransformer
+
+        self.encoder = SentenceTransformer(model)
+        self.labels = list(prototypes)
+        self.temperature = temperature
+        self.model_id = f"{model}@embedding:{text_hash(json.dumps(prototypes, sort_keys=True))[:12]}"
+        self.prototypes = np.stack([self._prototype(prototypes[label]) for label in self.labels])
+
+    def _prototype(self, texts: List[str]) -> np.ndarray:
+        mean = self.encoder.encode(texts, normalize_embeddings=True).mean(axis=0)
+        return mean / np.linalg.norm(mean)
+
+    def classify(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+
+        """
+        Scores texts against every label.
+
+        Args:
+            texts (List[str]): The texts to classify.
+            batch_size (int): The number of texts per encoder batch. Defaults to 32.
+
+        Returns:
+            List[Dict[str, Any]]: Per text, the labels and their scores sorted by descending score,
+                                  in the format of the zero-shot pipeline output.
+        """
+
+        embeddings = self.encoder.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+        logits = embeddings @ self.prototypes.T / self.temperature
+        scores = np.exp(logits - logits.max(axis=1, keepdims=True))
+        scores /= scores.sum(axis=1, keepdims=True)
+        order = np.argsort(-scores, axis=1)
+        return [{"labels": [self.labels[j] for j in row], "scores": scores[i, row].tolist()}
+                for i, row in enumerate(order)]
+
+
+def benchmark_zero_shot(texts: Sequence[str], models: Sequence[str] = tuple(ZERO_SHOT_MODELS),
+                        backends: Sequence[str] = ("torch", "onnx"), cache_dir: str = ".cache") -> Dict[str, Dict[str, float]]:
+
+    """
+    Measures the startup time and the per-row latency of each model and backend on sample texts.
+
+    Args:
+        texts (Sequence[str]): The sample texts, ideally real translated rows.
+        models (Sequence[str]): The models to measure. Defaults to all ZERO_SHOT_MODELS.
+        backends (Sequence[str]): The backends to measure. Defaults to "torch" and "onnx".
+        cache_dir (str): The directory exported ONNX models are cached in. Defaults to ".cache".
+
+    Returns:
+        Dict[str, Dict[str, float]]: The stats of RelevanceClassifier, keyed by "<model>/<backend>".
+    """
+
+    from curator import RelevanceClassifier
+
+    results = {}
+    for model in models:
+        for backend in backends:
+            classifier = RelevanceClassifier(model=model, backend=backend, model_cache_dir=cache_dir)
+            classifier.classify_batch(list(texts))
+            results[f"{model}/{backend}"] = classifier.stats()
+    return results
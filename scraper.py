@@ -1,15 +1,45 @@
 import asyncio
+import contextlib
 import datetime
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, List, Tuple, Optional, Iterable
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Mapping, Optional, Iterable, Set
 import threading
 import aiohttp
-import pandas as pd
 from bs4 import BeautifulSoup
 import snscrape.modules.twitter as sntwitter
 from tqdm.asyncio import tqdm
 from queue import Queue
 import itertools
+from dedup import DedupIndex
+from records import ScrapedItem, items_to_frame, parse_id
+from state_store import HighWaterMarkStore
+from manifest import RunManifest
+from storage import SCRAPE_SCHEMA, output_path, write_frame
+
+def create_session(limit: int = 100, limit_per_host: int = 8, keepalive_timeout: float = 30,
+                   ttl_dns_cache: int = 300, total_timeout: float = 60, connect_timeout: float = 10) -> aiohttp.ClientSession:
+
+    """
+    Creates an aiohttp session with a pooled, keep-alive connector that can be shared by all scrapers.
+
+    Args:
+        limit (int): The maximum number of open connections. Defaults to 100.
+        limit_per_host (int): The maximum number of open connections per host. Defaults to 8.
+        keepalive_timeout (float): Seconds an idle connection is kept open for reuse. Defaults to 30.
+        ttl_dns_cache (int): Seconds DNS lookups are cached. Defaults to 300.
+        total_timeout (float): The total timeout in seconds of a single request. Defaults to 60.
+        connect_timeout (float): The timeout in seconds for acquiring and opening a connection. Defaults to 10.
+
+    Returns:
+        aiohttp.ClientSession: The session. The caller owns it and must close it.
+    """
+
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host, keepalive_timeout=keepalive_timeout,
+                                     ttl_dns_cache=ttl_dns_cache)
+    timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
 
 class Scraper:
 
@@ -17,8 +47,85 @@ class Scraper:
     Base scraper class to be inherited by other scraper classes.
     """
 
-    def __init__(self):
-        self.data: List[Tuple[str, str, str, str, str, str]] = []
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, state: Optional[HighWaterMarkStore] = None,
+                 sink: Optional[asyncio.Queue] = None):
+
+        """
+        Args:
+            session (Optional[aiohttp.ClientSession]): A shared session to issue requests with. If None,
+                                                       each scrape opens and closes its own session.
+            state (Optional[HighWaterMarkStore]): The store of items seen on earlier runs. If given, only
+                                                  newer items are scraped and the store is advanced.
+            sink (Optional[asyncio.Queue]): A queue that scraped items are also streamed into as soon as
+                                            they are parsed. A bounded queue slows the scraper down when
+                                            the consumer falls behind.
+        """
+
+        self.data: List[ScrapedItem] = []
+        self.session = session
+        self.state = state
+        self.sink = sink
+        self.publish_seconds = 0.0
+        self._publishers = 0
+        self._publishing_since = 0.0
+
+    async def publish(self, rows: Iterable[ScrapedItem]) -> None:
+
+        """
+        Streams scraped items into the sink, waiting while it is full. Does nothing without a sink.
+
+        The time spent publishing is tracked, so that run_source does not count waiting on a slow
+        consumer against the source's timeout.
+
+        Args:
+            rows (Iterable[ScrapedItem]): The scraped items.
+        """
+
+        if self.sink is None:
+            return
+        loop = asyncio.get_running_loop()
+        if self._publishers == 0:
+            self._publishing_since = loop.time()
+        self._publishers += 1
+        try:
+            for row in rows:
+                await self.sink.put(row)
+        finally:
+            self._publishers -= 1
+            if self._publishers == 0:
+                self.publish_seconds += loop.time() - self._publishing_since
+
+    def blocked_seconds(self, now: float) -> float:
+
+        """
+        Returns the total time the scraper has spent publishing into the sink, including a publish in progress.
+
+        Concurrent publishes, e.g. of several subreddits, are counted once.
+
+        Args:
+            now (float): The current event loop time.
+
+        Returns:
+            float: The time in seconds.
+        """
+
+        return self.publish_seconds + (now - self._publishing_since if self._publishers else 0.0)
+
+    @contextlib.asynccontextmanager
+    async def client_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+
+        """
+        Yields the injected shared session, or a private session that is closed afterwards.
+
+        Yields:
+            aiohttp.ClientSession: The session to issue requests with.
+        """
+
+        if self.session is not None:
+            yield self.session
+        else:
+            async with create_session() as session:
+                yield session
 
     def run_tqdm(self, iterable: Iterable, desc: Optional[str] = None, mininterval: float = 0.1) -> Iterable:
 
@@ -49,47 +156,157 @@ class Scraper:
         """
         pass
 
+class RateLimiter:
+
+    """
+    Spaces out requests to each host so that no host receives more than a given number of requests per second.
+
+    The limiter also honours the X-Ratelimit-Remaining and X-Ratelimit-Reset headers that Reddit sends,
+    pausing a host until its window resets once the remaining budget is used up.
+    """
+
+    def __init__(self, requests_per_second: float):
+
+        """
+        Args:
+            requests_per_second (float): The maximum request rate per host.
+        """
+
+        self.interval = 1 / requests_per_second
+        self._next_slot: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, host: str) -> None:
+
+        """
+        Waits until the next request to the host is allowed.
+
+        Args:
+            host (str): The host the request goes to.
+        """
+
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def update_from_headers(self, host: str, headers: Mapping[str, str]) -> None:
+
+        """
+        Pauses the host until its rate limit window resets if the response says the budget is used up.
+
+        Args:
+            host (str): The host the response came from.
+            headers (Mapping[str, str]): The response headers.
+        """
+
+        try:
+            remaining = float(headers["X-Ratelimit-Remaining"])
+            reset = float(headers["X-Ratelimit-Reset"])
+        except (KeyError, ValueError):
+            return
+        if remaining < 1:
+            self.pause(host, reset)
+
+    def pause(self, host: str, seconds: float) -> None:
+
+        """
+        Holds back all requests to the host for the given number of seconds.
+
+        Args:
+            host (str): The host to pause.
+            seconds (float): The length of the pause.
+        """
+
+        resume = time.monotonic() + seconds
+        self._next_slot[host] = max(self._next_slot.get(host, resume), resume)
+
+
 class TwitterScraper(Scraper):
     """
     A class to scrape tweets using snscrape.
+
+    snscrape is blocking, so the scrape runs on its own thread. In streaming mode the thread pushes
+    each tweet into a bounded thread-safe queue as soon as it is parsed, and an asyncio consumer
+    reads them with stream(). The bounded queue pauses the thread when the consumer falls behind.
     """
 
-    def __init__(self):
-        super().__init__()
+    _end_of_stream = object()
+
+    def __init__(self, state: Optional[HighWaterMarkStore] = None, queue_size: int = 256):
+        super().__init__(state=state)
         self.thread  = None
         self.data = []
+        self.queue: Queue = Queue(queue_size)
 
-    def start_scrape(self, query: str, max_results: int) -> None:
+    def start_scrape(self, query: str, max_results: int, stream: bool = False) -> None:
         """
         Starts the scraping process in a separate thread.
 
         Args:
             query (str): The query to use for searching tweets.
             max_results (int): The maximum number of tweets to scrape.
+            stream (bool): Whether to push the tweets into the queue for stream() instead of self.data. Defaults to False.
         """
-        self.thread = threading.Thread(target=self.scrape, args=(query, max_results))
+        self.thread = threading.Thread(target=self.scrape, args=(query, max_results, stream), daemon=stream)
         self.thread.start()
 
-    def scrape(self, query: str, max_results: int) -> None:
+    def scrape(self, query: str, max_results: int, stream: bool = False) -> None:
         """
         Scrapes tweets using snscrape with a given query and maximum number of results.
 
+        Each tweet is normalized as it arrives, so no list of raw tweet objects is kept. If a state
+        store is set, only tweets newer than the newest tweet of the previous run are searched.
+
         Args:
             query (str): The query to use for searching tweets.
             max_results (int): The maximum number of tweets to scrape.
+            stream (bool): Whether to push the tweets into the queue for stream() instead of self.data. Defaults to False.
         """
-        scraped_tweets = []
-        tweet_iterator = sntwitter.TwitterSearchScraper(query).get_items()
+        search_query = query
+        mark = self.state.get("Twitter", query) if self.state is not None else None
+        if mark is not None:
+            search_query = f"{query} since_id:{mark['id']}"
+        tweet_iterator = sntwitter.TwitterSearchScraper(search_query).get_items()
 
-        for i, tweet in enumerate(self.run_tqdm(tweet_iterator)):
-            if i >= max_results:
-                break
-            scraped_tweets.append(tweet)
+        newest = None
+        try:
+            for i, tweet in enumerate(self.run_tqdm(tweet_iterator)):
+                if i >= max_results:
+                    break
+                # hashtags = [hashtag.tag for hashtag in tweet.entities['hashtags']]
+                hashtags = tweet.hashtags
+                row = ScrapedItem("Twitter", tweet.user.username, tweet.id, tweet.content, tweet.date.timestamp(),
+                                  hashtags=list(hashtags) if hashtags else None)
+                if stream:
+                    self.queue.put(row)
+                else:
+                    self.data.append(row)
+                if newest is None or tweet.id > newest.id:
+                    newest = tweet
+            # The mark is recorded before the end of the stream is signalled, so a consumer that
+            # saves the state once the stream ends always sees it.
+            if self.state is not None and newest is not None:
+                self.state.update("Twitter", query, newest.id, newest.date.timestamp())
+        finally:
+            if stream:
+                self.queue.put(self._end_of_stream)
+
+    async def stream(self) -> AsyncIterator[ScrapedItem]:
+        """
+        Yields the tweets of a streaming scrape as the scrape thread produces them.
 
-        for tweet in scraped_tweets:
-            # hashtags = [hashtag.tag for hashtag in tweet.entities['hashtags']]
-            hashtags = tweet.hashtags
-            self.data.append(("Twitter", tweet.user.username, tweet.id, tweet.content, tweet.date, hashtags))
+        Yields:
+            ScrapedItem: The scraped tweets.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            row = await loop.run_in_executor(None, self.queue.get)
+            if row is self._end_of_stream:
+                return
+            yield row
 
     def join(self) -> None:
         """
@@ -102,25 +319,165 @@ class RedditScraper(Scraper):
     """
     A class to scrape Reddit posts using aiohttp.
     """
-    async def scrape(self, subreddits: List[str], max_posts: int) -> None:
+
+    host = "www.reddit.com"
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, state: Optional[HighWaterMarkStore] = None,
+                 sink: Optional[asyncio.Queue] = None, max_concurrency: int = 8, requests_per_second: float = 10 / 60,
+                 max_retries: int = 3):
+
+        """
+        Args:
+            session (Optional[aiohttp.ClientSession]): A shared session to issue requests with.
+            state (Optional[HighWaterMarkStore]): The store of posts seen on earlier runs.
+            sink (Optional[asyncio.Queue]): A queue that each page of posts is streamed into.
+            max_concurrency (int): The maximum number of subreddit requests in flight at once. Defaults to 8.
+            requests_per_second (float): The maximum request rate to reddit.com. Defaults to 10 per minute,
+                                         Reddit's limit for unauthenticated clients.
+            max_retries (int): How often a page that was rate limited with a 429 is retried. Defaults to 3.
+        """
+
+        super().__init__(session, state, sink)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.max_retries = max_retries
+        self.incomplete: Set[str] = set()
+
+    page_size = 100
+
+    async def fetch_page(self, session: aiohttp.ClientSession, subreddit: str, after: Optional[str]) -> Dict[str, Any]:
+        """
+        Fetches one page of a subreddit's newest posts.
+
+        A 429 response pauses all requests to Reddit for the time given by its Retry-After or
+        X-Ratelimit-Reset header, after which the page is requested again, up to max_retries times.
+
+        Args:
+            session (aiohttp.ClientSession): The session to issue the request with.
+            subreddit (str): The subreddit to fetch.
+            after (Optional[str]): The cursor of the page to fetch, or None for the first page.
+
+        Returns:
+            Dict[str, Any]: The "data" object of the listing, holding "children" and the next "after" cursor.
+        """
+        url = f"https://{self.host}/r/{subreddit}/new.json"
+        params = {"limit": str(self.page_size)}
+        if after is not None:
+            params["after"] = after
+        for attempt in range(self.max_retries + 1):
+            async with self.semaphore:
+                await self.rate_limiter.acquire(self.host)
+                async with session.get(url, params=params, headers={"User-Agent": "Mozilla/5.0"}) as response:
+                    self.rate_limiter.update_from_headers(self.host, response.headers)
+                    if response.status == 429 and attempt < self.max_retries:
+                        self.rate_limiter.pause(self.host, self._retry_delay(response.headers))
+                        continue
+                    response.raise_for_status()
+                    json_data = await response.json()
+            return json_data["data"]
+
+    @staticmethod
+    def _retry_delay(headers: Mapping[str, str]) -> float:
+        for header in ("Retry-After", "X-Ratelimit-Reset"):
+            try:
+                return float(headers[header])
+            except (KeyError, ValueError):
+                continue
+        return 60.0
+
+    async def scrape_subreddit(self, session: aiohttp.ClientSession, subreddit: str, max_posts: int,
+                               cutoff: Optional[float] = None) -> List[ScrapedItem]:
+        """
+        Fetches the newest posts of a single subreddit, following the listing's `after` cursor.
+
+        Each cursor is only known once the previous page has arrived, so pages of one subreddit cannot
+        be requested in parallel. Instead the next page is requested as soon as its cursor is known and
+        downloads while the current page is processed. Paging stops at max_posts, at the end of the
+        listing, at the first post older than the cutoff, or at the first post already seen on an
+        earlier run. If a page fails, the posts collected so far are kept, but the subreddit is added
+        to self.incomplete so that its mark is not advanced past the posts that were missed.
+
+        Args:
+            session (aiohttp.ClientSession): The session to issue the requests with.
+            subreddit (str): The subreddit to scrape.
+            max_posts (int): The maximum number of posts to return.
+            cutoff (Optional[float]): A UTC epoch timestamp; older posts are not returned. Defaults to None.
+
+        Returns:
+            List[ScrapedItem]: The scraped posts, newest first.
+        """
+        rows: List[ScrapedItem] = []
+        mark = self.state.get("Reddit", subreddit) if self.state is not None else None
+        if mark is not None:
+            cutoff = max(cutoff or 0, mark["timestamp"])
+        next_page = asyncio.ensure_future(self.fetch_page(session, subreddit, None))
+        try:
+            while next_page is not None:
+                try:
+                    page = await next_page
+                except Exception as e:
+                    print(f"Failed to scrape r/{subreddit}: {e!r}")
+                    self.incomplete.add(subreddit)
+                    break
+                next_page = None
+                after = page.get("after")
+                posts = page["children"]
+                if after is not None and len(rows) + len(posts) < max_posts:
+                    next_page = asyncio.ensure_future(self.fetch_page(session, subreddit, after))
+
+                page_start = len(rows)
+                finished = False
+                for post in posts:
+                    post_data = post["data"]
+                    if len(rows) >= max_posts or (cutoff is not None and post_data["created_utc"] < cutoff):
+                        finished = True
+                        break
+                    post_id = parse_id("Reddit", post_data["id"])
+                    if mark is not None and post_id == mark["id"]:
+                        finished = True
+                        break
+                    rows.append(ScrapedItem("Reddit", post_data["author"], post_id, post_data["title"], post_data["created_utc"],
+                                            url=post_data["url"]))
+                await self.publish(rows[page_start:])
+                if finished:
+                    break
+            return rows
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def scrape(self, subreddits: List[str], max_posts: int, max_age: Optional[datetime.timedelta] = None) -> None:
         """
         Scrapes Reddit posts using aiohttp from the given subreddits with a maximum number of posts per subreddit.
 
+        The subreddits are fetched concurrently, bounded by the semaphore and the rate limiter, and the
+        posts are added to self.data in the order of the subreddits list. Each subreddit's posts are
+        kept and its mark is advanced as soon as it finishes, so a timeout that cancels the scrape only
+        loses the subreddits still in progress.
+
         Args:
             subreddits (List[str]): A list of subreddits to scrape.
             max_posts (int): The maximum number of posts to scrape per subreddit.
+            max_age (Optional[datetime.timedelta]): Posts older than this are skipped and end the paging. Defaults to None.
         """
-        async with aiohttp.ClientSession() as session:
-            for subreddit in self.run_tqdm(subreddits,desc="subreddits"):
-                url = f"https://www.reddit.com/r/{subreddit}/new.json"
-                async with session.get(url, headers={"User-Agent": "Mozilla/5.0"}) as response:
-                    json_data = await response.json()
-                    posts = json_data["data"]["children"]
-                    for i, post in enumerate(posts):
-                        if i >= max_posts:
-                            break
-                        post_data = post["data"]
-                        self.data.append(("Reddit", post_data["author"], post_data["id"], post_data["title"], post_data["created_utc"], post_data["url"]))
+        cutoff = time.time() - max_age.total_seconds() if max_age is not None else None
+
+        results: Dict[int, List[ScrapedItem]] = {}
+
+        async def scrape_one(index: int, session: aiohttp.ClientSession, subreddit: str) -> None:
+            result = await self.scrape_subreddit(session, subreddit, max_posts, cutoff)
+            results[index] = result
+            if self.state is not None and result and subreddit not in self.incomplete:
+                newest = max(result, key=lambda item: item.timestamp)
+                self.state.update("Reddit", subreddit, newest.id, newest.timestamp)
+
+        try:
+            async with self.client_session() as session:
+                tasks = [scrape_one(index, session, subreddit) for index, subreddit in enumerate(subreddits)]
+                await tqdm.gather(*tasks, desc="subreddits")
+        finally:
+            for index in sorted(results):
+                self.data.extend(results[index])
 
 class AIWeeklyScraper(Scraper):
     """
@@ -129,10 +486,14 @@ class AIWeeklyScraper(Scraper):
     async def scrape(self) -> None:
         """
         Scrapes AI Weekly articles using aiohttp and BeautifulSoup.
+
+        The page lists issues newest first and has no IDs or dates, so with a state store the URL of the
+        newest issue is the mark, and scraping stops at the first issue seen on an earlier run.
         """
-        async with aiohttp.ClientSession() as session:
-            url = "https://aiweekly.co/"
-            async with session.get(url) as response:
+        async with self.client_session() as session:
+            page_url = "https://aiweekly.co/"
+            mark = self.state.get("AI Weekly", page_url) if self.state is not None else None
+            async with session.get(page_url) as response:
                 html_content = await response.text()
                 soup = BeautifulSoup(html_content, 'html.parser')
                 articles = soup.find_all('article')
@@ -140,8 +501,15 @@ class AIWeeklyScraper(Scraper):
                     title = article.h2.get_text(strip=True)
                     url_element = article.find('a', class_='issue-link')
                     url = url_element['href'] if url_element is not None else None
+                    if mark is not None and url == mark["id"]:
+                        break
                     if url is not None:
-                        self.data.append(("AI Weekly", "AIWeekly", "", title, "", url))
+                        self.data.append(ScrapedItem("AI Weekly", "AIWeekly", None, title, url=url))
+
+        await self.publish(self.data)
+
+        if self.state is not None and self.data:
+            self.state.update("AI Weekly", page_url, self.data[0].url)
 
 class AITopicsScraper(Scraper):
 
@@ -149,21 +517,24 @@ class AITopicsScraper(Scraper):
     Scraper for the AI Topics website.
     """
 
-    def __init__(self) -> None:
-        self.data: List[Tuple[Any]] = []
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, state: Optional[HighWaterMarkStore] = None,
+                 sink: Optional[asyncio.Queue] = None) -> None:
+        super().__init__(session, state, sink)
+        self.data: List[ScrapedItem] = []
 
-    async def scrape(self) -> List[Tuple[Any]]:
+    async def scrape(self) -> None:
 
         """
         Scrapes AI-related articles from the AI Topics website using the aiohttp client and Beautiful Soup.
 
-        Returns:
-            List[Tuple[Any]]: A list of tuples containing the scraped data.
+        Like AIWeeklyScraper, the URL of the newest article is the mark, and scraping stops at the first
+        article seen on an earlier run.
         """
 
-        async with aiohttp.ClientSession() as session:
-           url = "https://aitopics.org/search"
-           async with session.get(url) as response:
+        async with self.client_session() as session:
+           page_url = "https://aitopics.org/search"
+           mark = self.state.get("AI Topics", page_url) if self.state is not None else None
+           async with session.get(page_url) as response:
                html_content = await response.text()
                soup = BeautifulSoup(html_content, 'html.parser')
                articles = soup.find_all('div', class_='ai1ec-event-container')
@@ -172,44 +543,114 @@ class AITopicsScraper(Scraper):
                    title = title_element.get_text(strip=True) if title_element is not None else None
                    url_element = article.find('a', class_='ai1ec-load-event')
                    url = url_element['href'] if url_element is not None else None
+                   if mark is not None and url == mark["id"]:
+                       break
                    if title is not None and url is not None:
-                       self.data.append(("AI Topics", "AITopics", "", title, "", url))
+                       self.data.append(ScrapedItem("AI Topics", "AITopics", None, title, url=url))
+
+        await self.publish(self.data)
+
+        if self.state is not None and self.data:
+            self.state.update("AI Topics", page_url, self.data[0].url)
 
-async def run_scrapers(executor: ThreadPoolExecutor) -> None:
+async def run_source(name: str, scraper: Scraper, scrape: Awaitable[None], timeout: float) -> bool:
 
     """
-    Run the scrapers concurrently using ThreadPoolExecutor and collect the scraped data.
+    Awaits a single source scraper with a timeout, isolating its failures from the other sources.
 
-    The TwitterScraper is run in a separate thread using the ThreadPoolExecutor, while the other scrapers
-    are run asynchronously using asyncio.
+    The timeout only covers the scraper's own work. Time spent waiting for a full sink is added to
+    the deadline, so a slow downstream stage does not make the source time out and drop rows.
 
     Args:
-        executor (ThreadPoolExecutor): The executor to run the TwitterScraper concurrently.
+        name (str): The name of the source, used in error messages.
+        scraper (Scraper): The scraper the coroutine belongs to.
+        scrape (Awaitable[None]): The scrape coroutine of the source.
+        timeout (float): The maximum number of seconds the source may take, not counting time blocked on the sink.
+
+    Returns:
+        bool: True if the source finished, False if it timed out or raised.
     """
 
-    combined_data = Queue()
-    reddit_scraper = RedditScraper()
-    aiweekly_scraper = AIWeeklyScraper()
-    aitopics_scraper = AITopicsScraper()
+    loop = asyncio.get_running_loop()
+    task = asyncio.ensure_future(scrape)
+    start = loop.time()
+    try:
+        while True:
+            now = loop.time()
+            remaining = start + timeout + scraper.blocked_seconds(now) - now
+            if remaining <= 0:
+                raise asyncio.TimeoutError
+            done, _ = await asyncio.wait({task}, timeout=remaining)
+            if done:
+                task.result()
+                return True
+    except asyncio.TimeoutError:
+        print(f"{name} scraper timed out after {timeout} seconds")
+    except Exception as e:
+        print(f"{name} scraper failed: {e!r}")
+    finally:
+        if not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+    return False
+
+
+async def run_scrapers(source_timeout: float = 120, state: Optional[HighWaterMarkStore] = None,
+                       sink: Optional[asyncio.Queue] = None) -> List[ScrapedItem]:
 
+    """
+    Run all asyncio scrapers concurrently on the running event loop and collect the scraped data.
 
-    loop = asyncio.get_running_loop()
-    await reddit_scraper.scrape(['ChatGPT', 'machinelearning', 'artificial', 'stablediffusion'], 10)
-    await aiweekly_scraper.scrape()
-    await aitopics_scraper.scrape()
+    All scrapers share one pooled session, which is closed once every source has finished. Every
+    source gets its own timeout, and a source that times out or fails does not affect the others.
+    Whatever a failed source scraped before it stopped is still kept. Time spent waiting on a full
+    sink does not count against the timeout.
 
-    combined_data.put(reddit_scraper.data + aiweekly_scraper.data + aitopics_scraper.data)
+    Args:
+        source_timeout (float): The maximum number of seconds a single source may take. Defaults to 120.
+        state (Optional[HighWaterMarkStore]): The store of items seen on earlier runs. Defaults to None.
+        sink (Optional[asyncio.Queue]): A queue that scraped items are streamed into as they arrive. Defaults to None.
+
+    Returns:
+        List[ScrapedItem]: The scraped items of all sources, in a fixed source order.
+    """
+
+    async with create_session() as session:
+        reddit_scraper = RedditScraper(session, state, sink)
+        aiweekly_scraper = AIWeeklyScraper(session, state, sink)
+        aitopics_scraper = AITopicsScraper(session, state, sink)
+
+        sources = [
+            ("Reddit", reddit_scraper, reddit_scraper.scrape(['ChatGPT', 'machinelearning', 'artificial', 'stablediffusion'], 1000,
+                                              datetime.timedelta(days=1))),
+            ("AI Weekly", aiweekly_scraper, aiweekly_scraper.scrape()),
+            ("AI Topics", aitopics_scraper, aitopics_scraper.scrape()),
+        ]
+        await asyncio.gather(*(run_source(name, scraper, scrape, source_timeout) for name, scraper, scrape in sources))
 
+    return list(itertools.chain.from_iterable(scraper.data for _, scraper, _ in sources))
 
-def main() -> None:
+
+def main(output_format: str = "parquet", csv_export: bool = False) -> RunManifest:
     """
-    Main function to run the scrapers concurrently using ThreadPoolExecutor.
+    Main function to run the scrapers concurrently.
     Scrapes data from Twitter, Reddit, AI Weekly, and AI Topics, combines the results,
-    and saves them to a CSV file with a timestamp in the file name.
+    drops items already seen in this or an earlier run, and saves them to a file named after
+    the unique run ID. A run manifest pointing at the file is written to scraper_output for the
+    translator to pick up.
+
+    Args:
+        output_format (str): The output format, "parquet", "arrow" or "csv". Defaults to "parquet".
+        csv_export (bool): Whether to also write a CSV copy of a Parquet or Arrow output. Defaults to False.
+
+    Returns:
+        RunManifest: The manifest of the run.
     """
 
-    combined_data = Queue()
-    twitter_scraper = TwitterScraper()
+    manifest = RunManifest("scraper")
+    state = HighWaterMarkStore(os.path.join('scraper_output', 'scrape_state.json'))
+    twitter_scraper = TwitterScraper(state)
     twitter_query = '("artificial intelligence" OR "AI" OR "GPT" OR "GPT-4" OR "OpenAI")'
     num_twitter_results = 1000
 
@@ -222,31 +663,31 @@ def main() -> None:
 
     # All th rest ofr the scrapers use asyncio
 
-    with ThreadPoolExecutor() as executor:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(run_scrapers(executor))
-        finally:
-            loop.close()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        items = loop.run_until_complete(run_scrapers(state=state))
+    finally:
+        loop.close()
 
     twitter_scraper.join()  # Wait for the thread to finish
-    combined_data.put(twitter_scraper.data)
-
-    '''
-        In order to put the scraped data into a dataframe, I have to extract
-        queue elements one by one and put them into a list that can be passed
-        to the pd.DataFrame initialixer
-
-        Additionally, the data is coming in as a list of lists.  We use
-        the itertools.chain_from_iterable to flatten the list.
-    '''
-
-    df_data = [combined_data.get() for _ in range(combined_data.qsize())]
-    df_flattened_data =  list(itertools.chain.from_iterable(df_data))
-
-    df = pd.DataFrame(df_flattened_data, columns=["Platform", "User", "ID", "Content", "Date", "URL/Hashtags"])
-    df.to_csv(f'scraper_output/scrape_results_{datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.csv', index=False)
+    items.extend(twitter_scraper.data)
+
+    dedup_index = DedupIndex(os.path.join('scraper_output', 'dedup_index.pkl'))
+    scraped_count = len(items)
+    items = dedup_index.filter(items)
+    print(f"Dropped {scraped_count - len(items)} duplicates ({dedup_index.url_duplicates} by URL, "
+          f"{dedup_index.content_duplicates} by content)")
+
+    df = items_to_frame(items)
+    file_stem = f'scrape_results_{manifest.run_id}'
+    output_file_path = output_path('scraper_output', file_stem, output_format)
+    write_frame(df, output_file_path, SCRAPE_SCHEMA, csv_export)
+    state.save()
+    dedup_index.save()
+    manifest.finish([output_file_path], len(df), scraped_count)
+    manifest.save('scraper_output')
+    return manifest
 
 if __name__ == "__main__":
     main()
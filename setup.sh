@@ -16,3 +16,15 @@ source .venv/bin/activate
 pip install -U pip
 pip install pandas requests beautifulsoup4 newspaper3k langdetect
 pip install transformers torch tqdm
+pip install pyarrow datasketch
+
+# Optional: compiled language detection backend (also needs lid.176.ftz from fasttext.cc)
+# pip install fasttext
+# Optional: int8 CTranslate2 translation backend
+# pip install ctranslate2
+# Optional: int8 ONNX Runtime relevance backend
+# pip install optimum[onnxruntime]
+# Optional: embedding relevance mode
+# pip install sentence-transformers
+# Optional: keyword and TF-IDF relevance cascade
+# pip install pyahocorasick scikit-learn
@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+import uuid
+from typing import Any, Dict, Optional
+
+
+class HighWaterMarkStore:
+
+    """
+    Persists the newest item seen per source and per feed (subreddit, query, page) between scraper runs.
+
+    The marks are kept in a small JSON file, so each scraper can fetch only the items that are newer
+    than the ones it saw on the previous run.
+    """
+
+    def __init__(self, path: str):
+
+        """
+        Args:
+            path (str): The JSON file the marks are stored in. It is created on the first save.
+        """
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._marks: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self._marks = json.load(f)
+
+    def get(self, source: str, key: str) -> Optional[Dict[str, Any]]:
+
+        """
+        Returns the high-water mark of a feed.
+
+        Args:
+            source (str): The source name, e.g. "Reddit".
+            key (str): The feed within the source, e.g. a subreddit or a query.
+
+        Returns:
+            Optional[Dict[str, Any]]: The mark with "id" and "timestamp" keys, or None if the feed was never scraped.
+        """
+
+        with self._lock:
+            mark = self._marks.get(source, {}).get(key)
+            return dict(mark) if mark is not None else None
+
+    def update(self, source: str, key: str, item_id: Any, timestamp: Optional[float] = None) -> None:
+
+        """
+        Records the newest item of a feed. A mark with a newer timestamp than the given one is kept.
+
+        Args:
+            source (str): The source name, e.g. "Reddit".
+            key (str): The feed within the source, e.g. a subreddit or a query.
+            item_id (Any): The ID of the newest item; must be JSON serializable.
+            timestamp (Optional[float]): The UTC epoch timestamp of the newest item, if the source has one.
+        """
+
+        with self._lock:
+            feeds = self._marks.setdefault(source, {})
+            current = feeds.get(key)
+            if (current is not None and timestamp is not None and current.get("timestamp") is not None
+                    and current["timestamp"] > timestamp):
+                return
+            feeds[key] = {"id": item_id, "timestamp": timestamp}
+
+    def save(self) -> None:
+
+        """
+        Writes the marks to disk, replacing the previous file atomically.
+        """
+
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._marks, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,194 @@
+import ast
+import datetime
+import os
+from typing import Any, Dict, List, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from records import parse_id, platform_column
+
+SCRAPE_SCHEMA = pa.schema([
+    ("Platform", pa.dictionary(pa.int8(), pa.string())),
+    ("User", pa.string()),
+    ("ID", pa.int64()),
+    ("Content", pa.string()),
+    ("Date", pa.timestamp("ns", tz="UTC")),
+    ("URL", pa.string()),
+    ("Hashtags", pa.list_(pa.string())),
+])
+
+TRANSLATED_SCHEMA = pa.schema(list(SCRAPE_SCHEMA) + [
+    ("source_language", pa.string()),
+    ("translated_text", pa.string()),
+])
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+
+def _to_timestamp(value: Any) -> pd.Timestamp:
+    if isinstance(value, datetime.datetime):
+        timestamp = pd.Timestamp(value)
+        return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+    if isinstance(value, str):
+        if not value:
+            return pd.NaT
+        try:
+            value = float(value)
+        except ValueError:
+            return _to_timestamp(pd.Timestamp(value).to_pydatetime())
+    if isinstance(value, (int, float)) and not pd.isna(value):
+        return pd.Timestamp(value, unit="s", tz="UTC")
+    return pd.NaT
+
+
+def _parse_list(value: Any) -> Optional[list]:
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if not isinstance(value, str) or not value.startswith("["):
+        return None
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        # numpy arrays are written to CSV without commas, e.g. "[0.1 0.7]"
+        return value.strip("[]").split()
+    return list(parsed) if isinstance(parsed, (list, tuple)) else None
+
+
+def normalize_scrape_frame(data: pd.DataFrame) -> pd.DataFrame:
+
+    """
+    Converts legacy scraper CSVs with the combined "URL/Hashtags" column to the types of SCRAPE_SCHEMA.
+
+    Dates given as epoch seconds, datetimes or strings become UTC timestamps. The combined column
+    is split into a "URL" string column and a "Hashtags" list column. Read back from CSV, Twitter
+    hashtags are list literals such as "['AI', 'GPT']"; these are parsed into "Hashtags".
+
+    Args:
+        data (pd.DataFrame): The scraped rows, with Platform, User, ID, Content, Date and URL/Hashtags columns.
+
+    Returns:
+        pd.DataFrame: The rows with the columns of SCRAPE_SCHEMA.
+    """
+
+    links = data["URL/Hashtags"]
+    return pd.DataFrame({
+        "Platform": platform_column(data["Platform"]),
+        "User": data["User"],
+        "ID": pd.array([parse_id(platform, value) for platform, value in zip(data["Platform"], data["ID"])], dtype="Int64"),
+        "Content": data["Content"],
+        "Date": pd.to_datetime(data["Date"].map(_to_timestamp), utc=True),
+        "URL": links.map(lambda value: value if isinstance(value, str) and value and _parse_list(value) is None else None),
+        "Hashtags": links.map(_parse_list),
+    })
+
+
+def _schema_for(data: pd.DataFrame, schema: pa.Schema) -> pa.Schema:
+    unknown = [column for column in data.columns if schema.get_field_index(column) == -1]
+    if unknown:
+        raise ValueError(f"Columns {unknown} are not part of the schema")
+    return pa.schema([schema.field(column) for column in data.columns])
+
+
+def output_path(directory: str, stem: str, output_format: str) -> str:
+
+    """
+    Builds the path of an output file in the given format.
+
+    Args:
+        directory (str): The output directory.
+        stem (str): The file name without extension.
+        output_format (str): One of "parquet", "arrow" or "csv".
+
+    Returns:
+        str: The output path.
+    """
+
+    if output_format not in FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return os.path.join(directory, stem + FORMATS[output_format])
+
+
+def write_frame(data: pd.DataFrame, path: str, schema: pa.Schema, csv_export: bool = False) -> None:
+
+    """
+    Writes a DataFrame as Parquet, Arrow IPC or CSV, depending on the file extension.
+
+    Parquet and Arrow files are written with the given schema, so types such as timestamps and
+    lists survive the round trip. The DataFrame may hold any subset of the schema's columns.
+
+    Args:
+        data (pd.DataFrame): The data to write.
+        path (str): The output path, ending in .parquet, .arrow or .csv.
+        schema (pa.Schema): The schema of the data.
+        csv_export (bool): Whether to also write a CSV copy next to a Parquet or Arrow file. Defaults to False.
+    """
+
+    extension = os.path.splitext(path)[1]
+    if extension == ".csv":
+        data.to_csv(path, index=False)
+        return
+
+    table = pa.Table.from_pandas(data, schema=_schema_for(data, schema), preserve_index=False)
+    if extension == ".parquet":
+        pq.write_table(table, path)
+    elif extension == ".arrow":
+        feather.write_feather(table, path, compression="uncompressed")
+    else:
+        raise ValueError(f"Unsupported file type: {path}")
+    if csv_export:
+        data.to_csv(os.path.splitext(path)[0] + ".csv", index=False)
+
+
+def _restore_csv_types(data: pd.DataFrame, schema: pa.Schema) -> pd.DataFrame:
+    if any(schema.get_field_index(column) == -1 for column in data.columns):
+        # Not written with this schema, e.g. a legacy scraper CSV; normalize_scrape_frame handles those.
+        return data
+    restored: Dict[str, Any] = {}
+    for column in data.columns:
+        field_type = schema.field(column).type
+        if pa.types.is_integer(field_type):
+            restored[column] = pd.array([None if pd.isna(value) else int(value) for value in data[column]], dtype="Int64")
+        elif pa.types.is_timestamp(field_type):
+            restored[column] = pd.to_datetime(data[column].map(_to_timestamp), utc=True)
+        elif pa.types.is_list(field_type):
+            values = data[column].map(_parse_list)
+            if pa.types.is_floating(field_type.value_type):
+                values = values.map(lambda items: [float(item) for item in items] if items is not None else None)
+            restored[column] = values
+        elif pa.types.is_dictionary(field_type):
+            restored[column] = data[column].astype("category")
+    return data.assign(**restored)
+
+
+def read_frame(path: str, columns: Optional[List[str]] = None, schema: Optional[pa.Schema] = None) -> pd.DataFrame:
+
+    """
+    Reads a DataFrame from a Parquet, Arrow IPC or CSV file, depending on the file extension.
+
+    CSV files do not store types, so if a schema is given and the CSV file's columns belong to it,
+    the integer, timestamp, list and dictionary columns are converted back to the types they were
+    written with. Integer columns are read as text first, so large IDs keep their precision.
+
+    Args:
+        path (str): The input path, ending in .parquet, .arrow or .csv.
+        columns (Optional[List[str]]): The columns to read. Parquet and Arrow files only read these
+                                       columns from disk. Defaults to all columns.
+        schema (Optional[pa.Schema]): The schema the file was written with. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The data.
+    """
+
+    extension = os.path.splitext(path)[1]
+    if extension == ".parquet":
+        return pq.read_table(path, columns=columns).to_pandas()
+    if extension == ".arrow":
+        return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+    if extension == ".csv":
+        if schema is None:
+            return pd.read_csv(path, usecols=columns)
+        dtypes = {field.name: str for field in schema if pa.types.is_integer(field.type)}
+        return _restore_csv_types(pd.read_csv(path, usecols=columns, dtype=dtypes), schema)
+    raise ValueError(f"Unsupported file type: {path}")
+
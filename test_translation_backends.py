@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("ctranslate2")
+
+from translation_backends import CTranslate2Backend, TorchBackend, backend_parity, get_backend_class
+
+MODEL_NAME = "Helsinki-NLP/opus-mt-de-en"
+SENTENCES = [
+    "Die KI kann jetzt Bilder malen.",
+    "Das neue Sprachmodell wurde heute veröffentlicht.",
+    "Forscher haben ein neuronales Netz für die Bilderkennung trainiert.",
+    "Die Regierung plant neue Regeln für künstliche Intelligenz.",
+]
+
+
+def test_get_backend_class():
+    assert get_backend_class("torch") is TorchBackend
+    assert get_backend_class("ctranslate2") is CTranslate2Backend
+    with pytest.raises(ValueError):
+        get_backend_class("onnx")
+
+
+def test_ctranslate2_matches_torch(tmp_path):
+    assert backend_parity(SENTENCES, MODEL_NAME, str(tmp_path)) >= 0.75
+
+
+def test_ctranslate2_conversion_is_cached(tmp_path):
+    first = CTranslate2Backend(MODEL_NAME, str(tmp_path))
+    second = CTranslate2Backend(MODEL_NAME, str(tmp_path))
+    assert first.model_path == second.model_path
+    assert not [name for name in (tmp_path / "ctranslate2").iterdir() if name.name.endswith(".tmp")]
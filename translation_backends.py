@@ -0,0 +1,190 @@
+import os
+import shutil
+import uuid
+from typing import Dict, List, Sequence, Type
+import torch
+from transformers import MarianMTModel, MarianTokenizer
+
+
+class TranslationBackend:
+
+    """
+    Base class of the inference backends that run a Marian model for Translator.
+
+    A backend owns the tokenizer and the model of one Hugging Face model name. The tokenizer is
+    always the Hugging Face MarianTokenizer, so every backend measures token lengths the same way.
+    """
+
+    name = ""
+
+    def __init__(self, model_name: str, cache_dir: str):
+
+        """
+        Args:
+            model_name (str): The Hugging Face model name.
+            cache_dir (str): The Hugging Face cache directory used for downloaded models.
+
+        Raises:
+            OSError: If the model does not exist.
+        """
+
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.tokenizer = MarianTokenizer.from_pretrained(model_name, cache_dir=cache_dir)
+
+    @property
+    def size_bytes(self) -> int:
+
+        """
+        Returns the approximate memory the resident model takes up.
+
+        Returns:
+            int: The size in bytes.
+        """
+
+        raise NotImplementedError
+
+    def translate(self, texts: List[str]) -> List[str]:
+
+        """
+        Translates one model batch.
+
+        Args:
+            texts (List[str]): The texts of the batch.
+
+        Returns:
+            List[str]: The translations, in the input order.
+        """
+
+        raise NotImplementedError
+
+
+class TorchBackend(TranslationBackend):
+
+    """
+    Runs the fp32 PyTorch MarianMTModel. This is the reference backend.
+    """
+
+    name = "torch"
+
+    def __init__(self, model_name: str, cache_dir: str):
+        super().__init__(model_name, cache_dir)
+        self.model = MarianMTModel.from_pretrained(model_name, cache_dir=cache_dir)
+        self.model.eval()
+
+    @property
+    def size_bytes(self) -> int:
+        tensors = list(self.model.parameters()) + list(self.model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+    def translate(self, texts: List[str]) -> List[str]:
+        inputs = self.tokenizer(texts, return_tensors="pt", padding=True, truncation=True, max_length=512)
+        with torch.inference_mode():
+            translated = self.model.generate(**inputs)
+        return [self.tokenizer.decode(t, skip_special_tokens=True) for t in translated]
+
+
+class CTranslate2Backend(TranslationBackend):
+
+    """
+    Runs the model with CTranslate2 using int8 weights on CPU.
+
+    The model is converted and quantized once and the converted copy is cached under
+    <cache_dir>/ctranslate2, so later runs only load it. The conversion writes to a temporary
+    directory that is moved into place, so worker processes converting the same model at once do
+    not corrupt each other's output. Requires the ctranslate2 package.
+    """
+
+    name = "ctranslate2"
+
+    def __init__(self, model_name: str, cache_dir: str, compute_type: str = "int8", intra_threads: int = 0):
+
+        """
+        Args:
+            model_name (str): The Hugging Face model name.
+            cache_dir (str): The Hugging Face cache directory used for downloaded models.
+            compute_type (str): The CTranslate2 quantization and compute type. Defaults to "int8".
+            intra_threads (int): The number of threads per translation; 0 lets CTranslate2 choose. Defaults to 0.
+        """
+
+        import ctranslate2
+
+        super().__init__(model_name, cache_dir)
+        self.model_path = os.path.join(cache_dir, "ctranslate2", f"{model_name.replace('/', '--')}-{compute_type}")
+        if not os.path.exists(self.model_path):
+            tmp_path = f"{self.model_path}.{uuid.uuid4().hex}.tmp"
+            try:
+                ctranslate2.converters.TransformersConverter(model_name).convert(tmp_path, quantization=compute_type)
+                os.replace(tmp_path, self.model_path)
+            except OSError:
+                # Another process moved its conversion into place first.
+                if not os.path.exists(os.path.join(self.model_path, "model.bin")):
+                    raise
+            finally:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        self.translator = ctranslate2.Translator(self.model_path, device="cpu", compute_type=compute_type,
+                                                 intra_threads=intra_threads)
+
+    @property
+    def size_bytes(self) -> int:
+        return os.path.getsize(os.path.join(self.model_path, "model.bin"))
+
+    def translate(self, texts: List[str]) -> List[str]:
+        sources = [self.tokenizer.convert_ids_to_tokens(self.tokenizer.encode(text, truncation=True, max_length=512))
+                   for text in texts]
+        results = self.translator.translate_batch(sources, max_batch_size=len(sources))
+        return [
+            self.tokenizer.decode(self.tokenizer.convert_tokens_to_ids(result.hypotheses[0]), skip_special_tokens=True)
+            for result in results
+        ]
+
+
+BACKENDS: Dict[str, Type[TranslationBackend]] = {
+    TorchBackend.name: TorchBackend,
+    CTranslate2Backend.name: CTranslate2Backend,
+}
+
+
+def get_backend_class(name: str) -> Type[TranslationBackend]:
+
+    """
+    Returns a translation backend class by name.
+
+    Args:
+        name (str): One of the keys of BACKENDS.
+
+    Returns:
+        Type[TranslationBackend]: The backend class.
+    """
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown translation backend: {name}")
+    return BACKENDS[name]
+
+
+def backend_parity(texts: Sequence[str], model_name: str, cache_dir: str, backend: str = "ctranslate2",
+                   reference: str = "torch") -> float:
+
+    """
+    Compares the translations of a backend against the reference backend.
+
+    Quantized backends are not bit-exact, so this reports the share of texts whose translations
+    match exactly. Use it to check a backend on a sample of real input before switching to it.
+
+    Args:
+        texts (Sequence[str]): The texts to translate.
+        model_name (str): The Hugging Face model name.
+        cache_dir (str): The Hugging Face cache directory used for downloaded models.
+        backend (str): The backend to check. Defaults to "ctranslate2".
+        reference (str): The reference backend. Defaults to "torch".
+
+    Returns:
+        float: The share of identical translations, between 0 and 1.
+    """
+
+    texts = list(texts)
+    if not texts:
+        return 1.0
+    expected = get_backend_class(reference)(model_name, cache_dir).translate(texts)
+    actual = get_backend_class(backend)(model_name, cache_dir).translate(texts)
+    return sum(a == b for a, b in zip(actual, expected)) / len(texts)
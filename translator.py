@@ -1,125 +1,489 @@
+import argparse
 import os
+import multiprocessing
 import pandas as pd
-from langdetect import detect
-from langdetect.lang_detect_exception import LangDetectException
-from langdetect import detect_langs
-from transformers import MarianMTModel, MarianTokenizer
-import sys
-import glob
-import datetime
+import torch
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from tqdm import tqdm
-from typing import List
+from typing import Dict, List, Optional, Tuple
+from cache import TranslationCache
+from manifest import RunManifest, load_manifest
+from storage import SCRAPE_SCHEMA, TRANSLATED_SCHEMA, normalize_scrape_frame, output_path, read_frame, write_frame
+from translation_backends import TranslationBackend, get_backend_class
+from language_detection import EnglishPrefilter, LanguageDetector, LangdetectDetector, create_detector
+
+DEFAULT_CACHE_DIR = "/home/bbrelin/src/repos/newsletter/.cache"
+FALLBACK_MODEL_NAME = "Helsinki-NLP/opus-mt-mul-en"
+
+
+class ModelRegistry:
+
+    """
+    Keeps loaded Marian models and tokenizers resident in memory between translate_batch calls.
+
+    Models are keyed by model name, so languages that share a model (e.g. 'es' and 'pt' both use
+    opus-mt-romance-en) share one resident copy. When loading a model would push the resident set
+    over the RAM budget, the least recently used models are evicted first.
+
+    Models are loaded through a TranslationBackend, PyTorch by default or e.g. int8 CTranslate2.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_memory_mb: float = 2048, backend: str = "torch"):
+
+        """
+        Args:
+            cache_dir (str): The Hugging Face cache directory used for downloaded models.
+            max_memory_mb (float): The RAM budget in megabytes for resident models. Defaults to 2048.
+            backend (str): The inference backend, "torch" or "ctranslate2". Defaults to "torch".
+        """
+
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self.backend_class = get_backend_class(backend)
+        self._models: "OrderedDict[str, Tuple[TranslationBackend, int]]" = OrderedDict()
+        self._model_names: Dict[str, str] = {}
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+
+    @staticmethod
+    def model_name_for(source_language: str) -> str:
+
+        """
+        Returns the preferred Marian model name for a source language.
+
+        Args:
+            source_language (str): The source language code.
+
+        Returns:
+            str: The Hugging Face model name translating the language to English.
+        """
+
+        if source_language in {'es', 'pt'}:
+            return "Helsinki-NLP/opus-mt-romance-en"
+        return f"Helsinki-NLP/opus-mt-{source_language}-en"
+
+    def _load(self, model_name: str) -> TranslationBackend:
+        start = time.perf_counter()
+        try:
+            return self.backend_class(model_name, self.cache_dir)
+        finally:
+            self.load_seconds += time.perf_counter() - start
+
+    def _evict_until(self, needed_bytes: int) -> None:
+        while self._models and self.memory_bytes + needed_bytes > self.max_memory_bytes:
+            _, (_, size) = self._models.popitem(last=False)
+            self.memory_bytes -= size
+            self.evictions += 1
+
+    def get(self, source_language: str) -> Tuple[str, TranslationBackend]:
+
+        """
+        Returns the resident model for a source language, loading it on first use.
+
+        Languages without a dedicated model fall back to opus-mt-mul-en, and the fallback is
+        remembered so the missing model is not looked up again.
+
+        Args:
+            source_language (str): The source language code.
+
+        Returns:
+            Tuple[str, TranslationBackend]: The model name and the backend holding the model and tokenizer.
+        """
+
+        model_name = self._model_names.get(source_language, self.model_name_for(source_language))
+        if model_name in self._models:
+            self._models.move_to_end(model_name)
+            self.hits += 1
+            return model_name, self._models[model_name][0]
+
+        self.misses += 1
+        try:
+            model = self._load(model_name)
+        except OSError:
+            model_name = FALLBACK_MODEL_NAME
+            self._model_names[source_language] = model_name
+            if model_name in self._models:
+                self._models.move_to_end(model_name)
+                return model_name, self._models[model_name][0]
+            model = self._load(model_name)
+
+        self._model_names[source_language] = model_name
+        size = model.size_bytes
+        self._evict_until(size)
+        self._models[model_name] = (model, size)
+        self.memory_bytes += size
+        return model_name, model
+
+    def stats(self) -> Dict[str, float]:
+
+        """
+        Returns the registry counters.
+
+        Returns:
+            Dict[str, float]: Hits, misses, evictions, total load time in seconds, resident model count and memory.
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "load_seconds": self.load_seconds,
+            "resident_models": len(self._models),
+            "memory_mb": self.memory_bytes / (1024 * 1024),
+        }
 
 
 class Translator:
-    def __init__(self):
-        pass
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_model_memory_mb: float = 2048,
+                 translation_cache: Optional[TranslationCache] = None, detector: Optional[LanguageDetector] = None,
+                 prefilter: Optional[EnglishPrefilter] = None, num_workers: int = 1, torch_threads: Optional[int] = None,
+                 shard_size: int = 256, backend: str = "torch", min_worker_memory_mb: float = 1024):
+
+        """
+        Args:
+            cache_dir (str): The Hugging Face cache directory used for downloaded models.
+            max_model_memory_mb (float): The RAM budget in megabytes for resident translation models, split evenly
+                                         across the worker processes, but see min_worker_memory_mb. Defaults to 2048.
+            translation_cache (Optional[TranslationCache]): A persistent cache of earlier translations. Defaults to None.
+            detector (Optional[LanguageDetector]): The language detection backend. Defaults to a seeded LangdetectDetector.
+            prefilter (Optional[EnglishPrefilter]): A cheap filter for rows that are obviously English. Defaults to None.
+            num_workers (int): The number of translation worker processes; 1 translates in this process. Defaults to 1.
+            torch_threads (Optional[int]): The torch thread count of each worker. Defaults to the CPU count divided by
+                                           the number of workers that get work in a call.
+            shard_size (int): The maximum number of texts per work item handed to a worker. Defaults to 256.
+            backend (str): The inference backend, "torch" or "ctranslate2". Defaults to "torch".
+            min_worker_memory_mb (float): The smallest model RAM budget of a worker process. One fp32 Marian model takes
+                                          about 300 MB, so a smaller share would keep only the last model loaded.
+                                          With many workers this floor raises the total budget. Defaults to 1024.
+        """
+
+        self.cache_dir = cache_dir
+        self.max_model_memory_mb = max_model_memory_mb
+        self.backend = backend
+        self.registry = ModelRegistry(cache_dir=cache_dir, max_memory_mb=max_model_memory_mb, backend=backend)
+        self.num_workers = num_workers
+        self.torch_threads = torch_threads
+        self.shard_size = shard_size
+        self.min_worker_memory_mb = min_worker_memory_mb
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.translation_cache = translation_cache
+        self.detector = detector if detector is not None else LangdetectDetector()
+        self.prefilter = prefilter
+        self.real_tokens = 0
+        self.padded_tokens = 0
 
-    def translate_batch(self, texts: List[str], source_language: str) -> List[str]:
+    def padding_ratio(self) -> float:
+
+        """
+        Returns the share of encoder positions spent on padding across all translated batches.
+
+        Returns:
+            float: Padding tokens divided by total padded tokens, 0.0 before anything was translated.
+        """
+
+        if not self.padded_tokens:
+            return 0.0
+        return 1 - self.real_tokens / self.padded_tokens
+
+    def _token_batches(self, lengths: List[int], max_batch_tokens: int, max_batch_size: int) -> List[List[int]]:
+
+        """
+        Splits texts into consecutive batches whose padded size stays within a token budget.
+
+        Args:
+            lengths (List[int]): The token length of each text.
+            max_batch_tokens (int): The maximum number of padded tokens (batch size * longest text) per batch.
+            max_batch_size (int): The maximum number of texts per batch.
+
+        Returns:
+            List[List[int]]: Batches of indices into lengths.
+        """
+
+        batches = []
+        batch: List[int] = []
+        longest = 0
+        for i, length in enumerate(lengths):
+            candidate_longest = max(longest, length)
+            if batch and (candidate_longest * (len(batch) + 1) > max_batch_tokens or len(batch) >= max_batch_size):
+                batches.append(batch)
+                batch, candidate_longest = [], length
+            batch.append(i)
+            longest = candidate_longest
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def translate_batch(self, texts: List[str], source_language: str, max_batch_tokens: int = 8192,
+                        max_batch_size: int = 64, bucket_by_length: bool = True) -> List[str]:
 
         """
         Translates a batch of texts to English.
 
+        The texts are split into model batches bounded by max_batch_tokens padded tokens, so a large
+        batch can be passed in without exhausting memory. With bucket_by_length the texts are sorted
+        by token length first, so short and long texts end up in separate batches and pay for less
+        padding. The translations are always returned in the input order.
+
         Args:
             texts (List[str]): A list of texts to be translated.
             source_language (str): The source language code.
+            max_batch_tokens (int, optional): The padded token budget per model batch. Defaults to 8192.
+            max_batch_size (int, optional): The maximum number of texts per model batch. Defaults to 64.
+            bucket_by_length (bool, optional): Whether to batch texts of similar length together. Defaults to True.
 
         Returns:
             List[str]: A list of translated texts in English.
         """
 
-        cache_dir = "/home/bbrelin/src/repos/newsletter/.cache"
-
         if source_language == 'en':
             return texts
-        elif source_language in {'es', 'pt'}:
-            model_name = "Helsinki-NLP/opus-mt-romance-en"
-        else:
-            model_name = f"Helsinki-NLP/opus-mt-{source_language}-en"
 
-        try:
-            model = MarianMTModel.from_pretrained(model_name, cache_dir=cache_dir)
-            tokenizer = MarianTokenizer.from_pretrained(model_name)
-        except OSError:
-            model_name = "Helsinki-NLP/opus-mt-mul-en"
-            model = MarianMTModel.from_pretrained(model_name, cache_dir=cache_dir)
-            tokenizer = MarianTokenizer.from_pretrained(model_name)
+        _, model = self.registry.get(source_language)
+
+        lengths = [len(ids) for ids in model.tokenizer(texts, truncation=True, max_length=512)["input_ids"]]
+        order = list(range(len(texts)))
+        if bucket_by_length:
+            order.sort(key=lambda i: lengths[i])
+
+        translations: List[str] = [""] * len(texts)
+        for batch in self._token_batches([lengths[i] for i in order], max_batch_tokens, max_batch_size):
+            indices = [order[i] for i in batch]
+            self.real_tokens += sum(lengths[i] for i in indices)
+            self.padded_tokens += max(lengths[i] for i in indices) * len(indices)
+            for i, translation in zip(indices, model.translate([texts[i] for i in indices])):
+                translations[i] = translation
+        return translations
+
+    def _cache_model_name(self, source_language: str) -> str:
+        model_name = self.registry.model_name_for(source_language)
+        return model_name if self.backend == "torch" else f"{model_name}@{self.backend}"
 
-        inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True, max_length=512)
-        translated = model.generate(**inputs)
-        return [tokenizer.decode(t, skip_special_tokens=True) for t in translated]
+    def _cached_translations(self, texts: List[str], source_language: str) -> Dict[str, str]:
+        if self.translation_cache is None:
+            return {}
+        model_name = self._cache_model_name(source_language)
+        keys = {text: self.translation_cache.key(text, source_language, model_name) for text in texts}
+        cached = self.translation_cache.get_many(keys.values())
+        return {text: cached[key] for text, key in keys.items() if key in cached}
+
+    def _cache_translations(self, translations: Dict[str, str], source_language: str) -> None:
+        if self.translation_cache is None:
+            return
+        model_name = self._cache_model_name(source_language)
+        self.translation_cache.put_many({self.translation_cache.key(text, source_language, model_name): translation
+                                         for text, translation in translations.items()})
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            worker_memory_mb = max(self.max_model_memory_mb / self.num_workers, self.min_worker_memory_mb)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.cache_dir, worker_memory_mb, self.backend),
+            )
+        return self._pool
+
+    def close(self) -> None:
 
-    def process_data(self, data: pd.DataFrame, batch_size: int = 10) -> pd.DataFrame:
         """
-        Processes the input DataFrame by translating the 'Content' column to English.
+        Shuts down the translation worker processes, if any were started.
+        """
+
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def translate_groups(self, groups: Dict[str, List[str]], max_batch_tokens: int = 8192, max_batch_size: int = 64,
+                         bucket_by_length: bool = True) -> Dict[str, Dict[str, str]]:
+
+        """
+        Translates distinct texts grouped by source language, in this process or sharded across worker processes.
+
+        With num_workers > 1, every group is split into shards of at most shard_size texts, and all
+        shards go onto the pool's shared work queue, one language after another, largest first, so
+        every idle worker picks up work and workers tend to stay on the model they just used. The
+        CPUs are divided among the workers that actually get a shard, so a call with only a few
+        shards still uses every core. A group or shard that fails is logged and left out of the result.
 
         Args:
-            data (pd.DataFrame): The input DataFrame with a 'Content' column.
-            batch_size (int, optional): The number of texts to be translated in a batch. Defaults to 10.
+            groups (Dict[str, List[str]]): The distinct texts to translate, by source language.
+            max_batch_tokens (int, optional): The padded token budget per model batch. Defaults to 8192.
+            max_batch_size (int, optional): The maximum number of texts per model batch. Defaults to 64.
+            bucket_by_length (bool, optional): Whether to batch texts of similar length together. Defaults to True.
 
         Returns:
-            pd.DataFrame: The output DataFrame with an additional 'translated_text' column containing the translated content in English.
+            Dict[str, Dict[str, str]]: The translation of each text, by source language.
         """
-        data['translated_text'] = None
 
-        def safe_detect(text: str) -> str:
-            if not isinstance(text, str):
-                return 'en'
+        results: Dict[str, Dict[str, str]] = {lang: {} for lang in groups}
+        if self.num_workers <= 1:
+            for lang, texts in tqdm(groups.items(), desc="Translating"):
+                try:
+                    results[lang] = dict(zip(texts, self.translate_batch(texts, lang, max_batch_tokens, max_batch_size,
+                                                                         bucket_by_length)))
+                except Exception as e:
+                    print(f"Translation from '{lang}' failed, keeping original text: {e}")
+            return results
 
+        shards = [(lang, texts[i:i + self.shard_size])
+                  for lang, texts in sorted(groups.items(), key=lambda group: len(group[1]), reverse=True)
+                  for i in range(0, len(texts), self.shard_size)]
+        busy_workers = max(1, min(self.num_workers, len(shards)))
+        torch_threads = self.torch_threads or max(1, (os.cpu_count() or 1) // busy_workers)
+        pool = self._get_pool()
+        futures: Dict[Future, Tuple[str, List[str]]] = {
+            pool.submit(_translate_shard, lang, texts, max_batch_tokens, max_batch_size, bucket_by_length,
+                        torch_threads): (lang, texts)
+            for lang, texts in shards
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Translating"):
+            lang, texts = futures[future]
             try:
-                langs = detect_langs(text)
-                return langs[0].lang
+                translations, real_tokens, padded_tokens = future.result()
             except Exception as e:
-                return 'en'  # return a default language when detection fails
+                print(f"Translation of a '{lang}' shard failed, keeping original text: {e}")
+                continue
+            results[lang].update(zip(texts, translations))
+            self.real_tokens += real_tokens
+            self.padded_tokens += padded_tokens
+        return results
 
-        def safe_translation(text, source_language):
-            if not isinstance(text, str):
-                return 'en'
-            try:
-                langs = detect_langs(text)
-                return langs[0].lang
-            except Exception as e:
-                return text
+    def process_data(self, data: pd.DataFrame, max_batch_tokens: int = 8192, max_batch_size: int = 64,
+                     bucket_by_length: bool = True) -> pd.DataFrame:
+        """
+        Processes the input DataFrame by translating the 'Content' column to English.
+
+        The language of every row is detected once, in a single pass, and stored in the
+        'source_language' column. Rows that pass the prefilter are marked English without detection.
+        Rows are grouped by language across the whole
+        DataFrame, and the distinct texts of each group that are not cached are translated in
+        token-bounded batches by translate_groups. The translations are written back in the
+        original row order.
+
+        Args:
+            data (pd.DataFrame): The input DataFrame with a 'Content' column.
+            max_batch_tokens (int, optional): The padded token budget per model batch. Defaults to 8192.
+            max_batch_size (int, optional): The maximum number of texts per model batch. Defaults to 64.
+            bucket_by_length (bool, optional): Whether to batch texts of similar length together. Defaults to True.
+
+        Returns:
+            pd.DataFrame: The output DataFrame with additional 'source_language' and 'translated_text' columns.
+        """
 
         texts = data['Content'].tolist()
-        translated_texts = []
-        for i in tqdm(range(0, len(texts), batch_size), desc="Translating"):
-            batch = texts[i:i + batch_size]
-            source_languages = [safe_detect(text) for text in batch]
-            batch_translations = [safe_translation([text], lang) for text, lang in zip(batch, source_languages)]
-            translated_texts.extend(batch_translations)
-
-        data['translated_text'] = translated_texts
+        source_languages = ['en'] * len(texts)
+        if self.prefilter is not None:
+            platforms = data['Platform'].tolist() if 'Platform' in data.columns else None
+            to_detect = [i for i, english in enumerate(self.prefilter.filter(texts, platforms)) if not english]
+            print(f"Prefilter passed {len(texts) - len(to_detect)} of {len(texts)} rows as English")
+        else:
+            to_detect = list(range(len(texts)))
+        for i, lang in zip(to_detect, self.detector.detect_many([texts[i] for i in to_detect])):
+            source_languages[i] = lang
+        data['source_language'] = source_languages
+
+        groups: Dict[str, List[str]] = {}
+        for text, lang in zip(texts, source_languages):
+            if lang != 'en':
+                groups.setdefault(lang, []).append(text)
+
+        translations: Dict[str, Dict[str, str]] = {}
+        missing: Dict[str, List[str]] = {}
+        for lang, group_texts in groups.items():
+            unique_texts = list(dict.fromkeys(group_texts))
+            translations[lang] = self._cached_translations(unique_texts, lang)
+            missing[lang] = [text for text in unique_texts if text not in translations[lang]]
+
+        new_translations = self.translate_groups({lang: group for lang, group in missing.items() if group},
+                                                 max_batch_tokens, max_batch_size, bucket_by_length)
+        for lang, group_translations in new_translations.items():
+            translations[lang].update(group_translations)
+            self._cache_translations(group_translations, lang)
+
+        data['translated_text'] = [translations.get(lang, {}).get(text, text) for text, lang in zip(texts, source_languages)]
+        print(f"Translation padding ratio: {self.padding_ratio():.1%}")
+        if self.translation_cache is not None:
+            print(f"Translation cache hit rate: {self.translation_cache.stats()['hit_rate']:.1%}")
         return data
 
-def main(scraper_output_directory="/home/bbrelin/src/repos/newsletter/scraper_output"):
+_worker_translator: Optional[Translator] = None
+
+
+def _init_worker(cache_dir: str, max_model_memory_mb: float, backend: str) -> None:
+    global _worker_translator
+    _worker_translator = Translator(cache_dir=cache_dir, max_model_memory_mb=max_model_memory_mb, backend=backend)
+
+
+def _translate_shard(source_language: str, texts: List[str], max_batch_tokens: int, max_batch_size: int,
+                     bucket_by_length: bool, torch_threads: int) -> Tuple[List[str], int, int]:
+    if torch.get_num_threads() != torch_threads:
+        torch.set_num_threads(torch_threads)
+    real_tokens, padded_tokens = _worker_translator.real_tokens, _worker_translator.padded_tokens
+    translations = _worker_translator.translate_batch(texts, source_language, max_batch_tokens, max_batch_size, bucket_by_length)
+    return (translations, _worker_translator.real_tokens - real_tokens,
+            _worker_translator.padded_tokens - padded_tokens)
+
+
+def main(scraper_output_directory="/home/bbrelin/src/repos/newsletter/scraper_output", detector_backend="langdetect",
+         output_format="parquet", csv_export=False, run_id=None, translator_output_directory="translator_output",
+         num_workers=1, backend="torch", english_prefilter=True) -> RunManifest:
 
     """
-    Reads data from the latest input CSV file in the scraper_output_directory, translates the content to English.
+    Reads the output of a scraper run, translates the content to English and writes a run manifest.
+
+    The input file is resolved from the scraper's run manifest: the given run, or the latest one.
 
     Args:
-        scraper_output_directory (str, optional): The directory containing the scraper output CSV files. Defaults to "/home/bbrelin/src/repos/newsletter/scraper_output".
+        scraper_output_directory (str, optional): The directory containing the scraper output files and manifests. Defaults to "/home/bbrelin/src/repos/newsletter/scraper_output".
+        detector_backend (str, optional): The language detection backend, "langdetect" or "fasttext". Defaults to "langdetect".
+        output_format (str, optional): The output format, "parquet", "arrow" or "csv". Defaults to "parquet".
+        csv_export (bool, optional): Whether to also write a CSV copy of a Parquet or Arrow output. Defaults to False.
+        run_id (str, optional): The scraper run to translate. Defaults to the latest run.
+        translator_output_directory (str, optional): The directory the translated file and manifest are written to. Defaults to "translator_output".
+        num_workers (int, optional): The number of translation worker processes. Defaults to 1.
+        backend (str, optional): The translation inference backend, "torch" or "ctranslate2". Defaults to "torch".
+        english_prefilter (bool, optional): Whether rows that are obviously English skip language detection. Defaults to True.
+
+    Returns:
+        RunManifest: The manifest of the translation run.
     """
 
+    scraper_manifest = load_manifest(scraper_output_directory, run_id)
+    input_file_path = scraper_manifest.output_file
+    manifest = RunManifest("translator", input_file=input_file_path, parent_run_id=scraper_manifest.run_id)
 
-    list_of_files = glob.glob(os.path.join(scraper_output_directory, "scrape_results_*.csv"))
-    latest_file = max(list_of_files, key=os.path.getmtime)
+    output_file_stem = f"translated_{manifest.run_id}"
+    output_file_path = output_path(translator_output_directory, output_file_stem, output_format)
 
-    input_file_path = latest_file
-    current_time = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    output_file_name = f"translated_{os.path.basename(latest_file).split('_', 1)[1].split('.', 1)[0]}_{current_time}.csv"
-    output_file_path = os.path.join(os.getcwd(), "translated_output", output_file_name)
+    data = read_frame(input_file_path, schema=SCRAPE_SCHEMA)
+    if "URL/Hashtags" in data.columns:
+        data = normalize_scrape_frame(data)
+    translation_cache = TranslationCache(os.path.join(DEFAULT_CACHE_DIR, "translations.sqlite"))
+    processor = Translator(translation_cache=translation_cache, detector=create_detector(detector_backend),
+                           prefilter=EnglishPrefilter() if english_prefilter else None, num_workers=num_workers,
+                           backend=backend)
+    try:
+        processed_data = processor.process_data(data)
+        write_frame(processed_data, output_file_path, TRANSLATED_SCHEMA, csv_export)
+    finally:
+        processor.close()
+        translation_cache.close()
 
-    data = pd.read_csv(input_file_path)
-    processor = Translator()
-    processed_data = processor.process_data(data)
-    processed_data.to_csv(output_file_path, index=False)
+    manifest.finish([output_file_path], len(processed_data), len(data))
+    manifest.save(translator_output_directory)
+    return manifest
 
 if __name__ == "__main__":
 
-    if len(sys.argv) == 2:
-        scraper_output_directory = sys.argv[1]
-    else:
-        scraper_output_directory = "/home/bbrelin/src/repos/newsletter/scraper_output"
+    parser = argparse.ArgumentParser(description="Translate the output of a scraper run to English.")
+    parser.add_argument("scraper_output_directory", nargs="?", default="/home/bbrelin/src/repos/newsletter/scraper_output")
+    parser.add_argument("--run-id", help="The scraper run to translate. Defaults to the latest run.")
+    args = parser.parse_args()
 
-    main(scraper_output_directory)
+    main(args.scraper_output_directory, run_id=args.run_id)